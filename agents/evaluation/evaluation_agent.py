@@ -25,6 +25,8 @@ Evaluation Dimensions:
 import asyncio
 import json
 import uuid
+from collections import deque
+from itertools import islice
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any, Tuple
 from loguru import logger
@@ -128,34 +130,10 @@ class EvaluationAgent(BaseAgent):
         logger.debug(f"[{self.agent_name}] Tracking decision for session: {session_id[:8]}...")
         
         try:
-            # Create structured decision point
-            decision_point = DecisionPoint(
-                turn=decision_data.get("turn", 0),
-                vulnerability=decision_data.get("vulnerability", "unknown"),
-                user_choice=decision_data.get("user_choice", ""),
-                correct_choice=decision_data.get("correct_choice", ""),
-                risk_score_impact=0.0,  # Will be calculated
-                timestamp=decision_data.get("timestamp", datetime.now(timezone.utc).timestamp()),
-                confidence_level=decision_data.get("confidence_level")
+            decision_point, evaluation = await self._record_decision(
+                self._session_decisions(session_id), decision_data
             )
             
-            # Calculate risk score impact
-            evaluation = await self._evaluate_decision(decision_point, decision_data)
-            decision_point.risk_score_impact = evaluation["risk_impact"]
-            
-            # Store in session-level tracking
-            if session_id not in self.evaluation_metrics:
-                self.evaluation_metrics[session_id] = {
-                    "decisions": [],
-                    "patterns": {},
-                    "started_at": datetime.now(timezone.utc)
-                }
-            
-            self.evaluation_metrics[session_id]["decisions"].append({
-                "decision_point": decision_point.dict(),
-                "evaluation": evaluation
-            })
-            
             logger.info(
                 f"[{self.agent_name}] Decision tracked: "
                 f"{decision_point.vulnerability} -> {evaluation['outcome']}"
@@ -167,6 +145,82 @@ class EvaluationAgent(BaseAgent):
             logger.error(f"[{self.agent_name}] Failed to track decision: {e}")
             return {"error": str(e), "outcome": "error"}
     
+    async def track_decisions_bulk(
+        self,
+        session_id: str,
+        decisions: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Track several decision points for one session in a single call.
+        
+        Equivalent to calling track_decision for each item in order, but the
+        session's metrics entry is looked up once and a single summary is logged.
+        A decision that fails to evaluate yields an error entry without
+        stopping the rest of the batch.
+        
+        Args:
+            session_id: Session where the decisions were made
+            decisions: Decision details, each as accepted by track_decision
+            
+        Returns:
+            One evaluation per decision, in input order
+        """
+        logger.debug(f"[{self.agent_name}] Tracking {len(decisions)} decisions for session: {session_id[:8]}...")
+        
+        tracked = self._session_decisions(session_id)
+        evaluations = []
+        for decision_data in decisions:
+            try:
+                _, evaluation = await self._record_decision(tracked, decision_data)
+            except Exception as e:
+                logger.error(f"[{self.agent_name}] Failed to track decision: {e}")
+                evaluation = {"error": str(e), "outcome": "error"}
+            evaluations.append(evaluation)
+        
+        logger.info(f"[{self.agent_name}] Decisions tracked: {len(evaluations)} for session {session_id[:8]}")
+        
+        return evaluations
+    
+    def _session_decisions(self, session_id: str) -> "deque[Dict[str, Any]]":
+        """Return the tracked decision list for a session, creating its metrics entry on first use."""
+        metrics = self.evaluation_metrics.get(session_id)
+        if metrics is None:
+            metrics = self.evaluation_metrics[session_id] = {
+                # Bounded: only the newest max_decisions_per_session are kept
+                "decisions": deque(maxlen=self.config.max_decisions_per_session),
+                "patterns": {},
+                "started_at": datetime.now(timezone.utc)
+            }
+        return metrics["decisions"]
+    
+    async def _record_decision(
+        self,
+        tracked: "deque[Dict[str, Any]]",
+        decision_data: Dict[str, Any]
+    ) -> Tuple[DecisionPoint, Dict[str, Any]]:
+        """Evaluate one decision and append it to a session's tracked decisions."""
+        # Create structured decision point
+        decision_point = DecisionPoint(
+            turn=decision_data.get("turn", 0),
+            vulnerability=decision_data.get("vulnerability", "unknown"),
+            user_choice=decision_data.get("user_choice", ""),
+            correct_choice=decision_data.get("correct_choice", ""),
+            risk_score_impact=0.0,  # Will be calculated
+            timestamp=decision_data.get("timestamp", datetime.now(timezone.utc).timestamp()),
+            confidence_level=decision_data.get("confidence_level")
+        )
+        
+        # Calculate risk score impact
+        evaluation = await self._evaluate_decision(decision_point, decision_data)
+        decision_point.risk_score_impact = evaluation["risk_impact"]
+        
+        tracked.append({
+            "decision_point": decision_point.model_dump(),
+            "evaluation": evaluation
+        })
+        
+        return decision_point, evaluation
+    
     async def calculate_session_score(
         self,
         session: CyberGuardSession
@@ -205,7 +259,7 @@ class EvaluationAgent(BaseAgent):
                     evaluation = await self._evaluate_decision(dp, {"response_time": 30.0}) # Default to optimal time
                     
                     decisions.append({
-                        "decision_point": dp.dict(),
+                        "decision_point": dp.model_dump(),
                         "evaluation": evaluation
                     })
             
@@ -298,6 +352,8 @@ class EvaluationAgent(BaseAgent):
         
         Supported message types:
         - track_decision: Record a user decision point
+        - decisions_made: Record a batch of decision points
+        - evaluate_batch: Process several queued events in order
         - evaluate_session: Calculate session score
         - get_risk_assessment: Get current risk level
         - request_difficulty: Get difficulty recommendation
@@ -331,6 +387,14 @@ class EvaluationAgent(BaseAgent):
                 response_payload = await self._handle_track_decision(message.payload)
                 response_type = "decision_tracked"
 
+            elif message.message_type == "decisions_made":
+                response_payload = await self._handle_track_decisions(message.payload)
+                response_type = "decisions_tracked"
+
+            elif message.message_type == "evaluate_batch":
+                response_payload = await self._handle_evaluate_batch(message)
+                response_type = "batch_processed"
+
             elif message.message_type == "get_evaluation":
                 # Map get_evaluation to evaluate_session logic
                 response_payload = await self._handle_evaluate_session(message.payload)
@@ -376,6 +440,36 @@ class EvaluationAgent(BaseAgent):
             "tracked_at": datetime.now(timezone.utc).isoformat()
         }
     
+    async def _handle_track_decisions(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle a batch of decisions buffered by the orchestrator."""
+        session_id = payload.get("session_id")
+        
+        evaluations = await self.track_decisions_bulk(session_id, payload.get("decisions", []))
+        
+        return {
+            "session_id": session_id,
+            "evaluations": evaluations,
+            "tracked_at": datetime.now(timezone.utc).isoformat()
+        }
+    
+    async def _handle_evaluate_batch(self, message: AgentMessage) -> Dict[str, Any]:
+        """Handle a batch of queued events, delivering each in arrival order."""
+        responses = []
+        for event in message.payload.get("events", []):
+            responses.append(await self.process_message(AgentMessage(
+                sender_agent=message.sender_agent,
+                recipient_agent=self.agent_name,
+                message_type=event["message_type"],
+                session_id=event.get("session_id", message.session_id),
+                payload=event.get("payload", {})
+            )))
+        
+        return {
+            "processed": len(responses),
+            "errors": sum(1 for response in responses if response.message_type == "error"),
+            "processed_at": datetime.now(timezone.utc).isoformat()
+        }
+    
     async def _handle_evaluate_session(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Handle session evaluation request."""
         session_data = payload.get("session")
@@ -384,8 +478,11 @@ class EvaluationAgent(BaseAgent):
             return {"error": "Missing session data"}
             
         try:
-            # Reconstruct session object from payload
-            session = CyberGuardSession(**session_data)
+            # In-process callers pass the session itself; otherwise reconstruct it
+            if isinstance(session_data, CyberGuardSession):
+                session = session_data
+            else:
+                session = CyberGuardSession(**session_data)
             evaluation = await self.calculate_session_score(session)
             return evaluation
         except Exception as e:
@@ -402,8 +499,8 @@ class EvaluationAgent(BaseAgent):
         if not decisions:
             return {"risk_level": "unknown", "risk_score": 0.0}
         
-        # Calculate current risk based on recent decisions
-        recent_decisions = decisions[-5:]  # Last 5 decisions
+        # Calculate current risk based on recent decisions (last 5)
+        recent_decisions = list(islice(decisions, max(0, len(decisions) - 5), None))
         risk_impacts = [d["decision_point"]["risk_score_impact"] for d in recent_decisions]
         avg_risk = sum(risk_impacts) / len(risk_impacts)
         
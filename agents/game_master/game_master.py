@@ -12,6 +12,7 @@ This serves as the reference implementation for all other agents in the system.
 """
 
 import asyncio
+import time
 import uuid
 from typing import Dict, Any, Optional, List
 from datetime import datetime
@@ -66,13 +67,11 @@ class GameMasterAgent(OrchestratorAgent):
         self.debrief_generator = DebriefGenerator()
         
         # Agent state
-        self.available_threat_agents = [
-            "phishing_agent",
-            "vishing_agent", 
-            "bec_agent",
-            "physical_agent",
-            "insider_agent"
-        ]
+        # Scenario type -> threat actor agent, resolved once instead of per scenario
+        self.threat_agents_by_type: Dict[str, str] = {
+            threat.value: f"{threat.value}_agent" for threat in ThreatType
+        }
+        self.available_threat_agents = list(self.threat_agents_by_type.values())
         # active_coordinations is now inherited from OrchestratorAgent
         
     async def initialize(self) -> None:
@@ -96,7 +95,7 @@ class GameMasterAgent(OrchestratorAgent):
         print(f"[{self.agent_name}] Shutting down Game Master...")
         
         # Complete any active sessions
-        for session_id, session in self.active_sessions.items():
+        for session_id, session in list(self.active_sessions.items()):
             if session.end_time is None:
                 print(f"[{self.agent_name}] Completing active session: {session_id}")
                 await self.complete_scenario(session_id, reason="system_shutdown")
@@ -177,12 +176,12 @@ class GameMasterAgent(OrchestratorAgent):
         )
         
         # Activate appropriate threat actor based on scenario type
-        threat_agent = f"{scenario_type}_agent"
+        threat_agent = self.threat_agents_by_type.get(scenario_type)
         session.threat_actor_active = threat_agent
         
         # Request threat scenario from specialized agent
         threat_response = None
-        if threat_agent in self.available_threat_agents:
+        if threat_agent is not None:
             print(f"[{self.agent_name}] Coordinating with {threat_agent} for scenario generation")
             threat_response = await self.coordinate_with_agent(
                 target_agent=threat_agent,
@@ -337,9 +336,9 @@ class GameMasterAgent(OrchestratorAgent):
         """
         
         # Activate appropriate threat actor based on scenario type
-        threat_agent = f"{session.scenario_type.value}_agent"
+        threat_agent = self.threat_agents_by_type.get(session.scenario_type.value)
         
-        if threat_agent in self.available_threat_agents:
+        if threat_agent is not None:
             # Request threat scenario from specialized agent
             threat_response = await self.coordinate_with_agent(
                 target_agent=threat_agent,
@@ -534,7 +533,7 @@ class GameMasterAgent(OrchestratorAgent):
             return {"error": f"Session {session_id} not found"}
         
         session = self.active_sessions[session_id]
-        session.end_time = datetime.utcnow().timestamp()
+        session.end_time = time.time()
         session.current_state = "completed"
         
         print(f"[{self.agent_name}] Completing scenario {session_id}, reason: {reason}")
@@ -313,12 +313,10 @@ async def get_session(session_id: str):
     try:
         orchestrator = await get_orchestrator()
         
-        # Get session from active sessions or storage
-        session = orchestrator.active_sessions.get(session_id)
+        # Get session from active sessions, the shared cache or storage
+        session = await orchestrator.get_session(session_id)
         if not session:
-            session = await orchestrator.session_manager.load_session(session_id)
-            if not session:
-                raise HTTPException(status_code=404, detail="Session not found")
+            raise HTTPException(status_code=404, detail="Session not found")
         
         return {
             "session_id": session.session_id,
@@ -376,13 +374,7 @@ async def list_active_sessions():
 
 
 if __name__ == "__main__":
-    import uvicorn
+    from main import main
     
     logger.info("🚀 Starting CyberGuard Academy API server")
-    uvicorn.run(
-        "api:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
+    main()
@@ -4,6 +4,8 @@ __version__ = "0.1.0"
 __author__ = "CyberGuard Academy Team"
 __description__ = "Multi-agent cybersecurity training system with invisible assessment"
 
+import os
+
 from .models import (
     CyberGuardSession,
     DecisionPoint,
@@ -15,6 +17,7 @@ from .models import (
     SocialEngineeringPattern,
     DifficultyLevel,
     UserRole,
+    load_session_json,
 )
 
 __all__ = [
@@ -28,4 +31,20 @@ __all__ = [
     "SocialEngineeringPattern", 
     "DifficultyLevel",
     "UserRole",
-]
\ No newline at end of file
+    "load_session_json",
+    "GroqClient",
+]
+
+
+def __getattr__(name):
+    """Lazily expose heavy submodules so importing the package stays cheap."""
+    if name == "GroqClient":
+        from .groq_client import GroqClient
+        return GroqClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# CI hatch: pay the SDK import and client setup up front instead of on first use
+if os.environ.get("CYBERGUARD_EAGER_IMPORT") == "1":
+    from .groq_client import GroqClient
+    GroqClient.initialize()
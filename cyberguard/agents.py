@@ -106,6 +106,21 @@ class BaseAgent(ABC):
             "agent_name": self.agent_name
         }
 
+    def release_session(self, session_id: str) -> Optional[CyberGuardSession]:
+        """
+        Stop tracking a session in this agent.
+        
+        Used when the owner of the session (e.g. the orchestrator) completes or
+        evicts it, so agents do not keep every session they have ever seen.
+        
+        Args:
+            session_id: ID of session to drop
+            
+        Returns:
+            The dropped session, or None if this agent was not tracking it
+        """
+        return self.active_sessions.pop(session_id, None)
+
     def list_active_sessions(self) -> List[Dict[str, Any]]:
         """
         List all currently active sessions for this agent.
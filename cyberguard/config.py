@@ -20,6 +20,11 @@ class Settings(BaseSettings):
     debug: bool = Field(default=True, description="Enable debug mode")
     log_level: str = Field(default="INFO", description="Logging level")
     
+    # Server Configuration
+    api_host: str = Field(default="0.0.0.0", description="Host the API server binds to")
+    api_port: int = Field(default=8000, description="Port the API server listens on")
+    api_workers: int = Field(default=1, description="Uvicorn worker processes when not in debug/reload mode; more than one requires REDIS_URL")
+    
     # AI Provider Configuration
     ai_provider: str = Field(default="groq", description="AI provider: 'groq'")
     groq_api_key: str = Field(default="", description="Groq API key")
@@ -30,12 +35,31 @@ class Settings(BaseSettings):
     flash_model: str = Field(default="llama-3.1-8b-instant", description="Flash model for high-volume generation")
     default_temperature_game_master: float = Field(default=0.3, description="Temperature for Game Master agent")
     default_temperature_threat_actors: float = Field(default=0.7, description="Temperature for threat actor agents")
+    enable_llm_cache: bool = Field(default=True, description="Cache deterministic (or opted-in) LLM responses in memory")
+    llm_cache_max_entries: int = Field(default=512, description="Maximum number of cached LLM responses")
+    max_concurrent_llm_requests: int = Field(default=8, description="Maximum in-flight LLM API requests per process")
+    llm_rate_limit_retries: int = Field(default=3, description="Retries after a 429 rate-limit response")
+    llm_requests_per_minute: int = Field(default=0, description="Client-side cap on LLM API requests per rolling minute (0 disables)")
     
     # Agent Configuration
     max_conversation_turns: int = Field(default=25, description="Maximum turns per scenario")
     default_difficulty_level: int = Field(default=3, description="Starting difficulty level (1-5)")
     target_success_rate: float = Field(default=0.7, description="Target success rate for adaptive difficulty")
     session_timeout_minutes: int = Field(default=30, description="Session timeout in minutes")
+    max_active_sessions: int = Field(default=1000, description="Sessions kept in memory per process before LRU eviction")
+    session_reaper_interval_seconds: int = Field(default=60, description="How often idle in-memory sessions are swept")
+    decision_batch_size: int = Field(default=4, description="Decisions buffered per session before notifying the Evaluation Agent")
+    max_decisions_per_session: int = Field(default=1024, description="Most recent decisions the Evaluation Agent keeps per session")
+    evaluation_batch_max_events: int = Field(default=32, description="Maximum queued evaluation events delivered in one batch")
+    evaluation_batch_window_ms: int = Field(default=50, description="How long the evaluation worker waits to fill a batch")
+    evaluation_drain_timeout_seconds: float = Field(default=30.0, description="Longest a completing session waits for its queued evaluation events")
+    session_flush_interval_seconds: float = Field(default=2.0, description="How often dirty sessions are written to disk")
+    session_flush_delay_seconds: float = Field(default=1.0, description="Minimum time a session stays dirty before it is written")
+    
+    # Cache Configuration
+    redis_url: str = Field(default="", description="Redis URL(s), comma-separated to shard, for the shared session/profile cache (disabled if empty)")
+    session_cache_ttl_seconds: int = Field(default=3600, description="TTL for sessions cached in Redis")
+    profile_cache_ttl_seconds: int = Field(default=300, description="TTL for user profiles cached in Redis")
     
     # Security Configuration
     safe_redirect_base_url: str = Field(
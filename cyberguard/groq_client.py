@@ -9,11 +9,35 @@ Provides configured model instances for different agent types.
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import os
-from typing import Optional, Dict, Any, List
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Optional, Dict, Any, List, AsyncIterator
+
+from loguru import logger
+
+try:
+    import orjson
+except ImportError:  # declared dependency; stdlib json keeps bare checkouts working
+    orjson = None
 
 from cyberguard.config import settings
 
+
+# Conversation roles used across agents, mapped onto Groq chat roles
+_ROLE_MAP = {
+    "user": "user",
+    "human": "user",
+    "assistant": "assistant",
+    "model": "assistant",
+    "game_master": "assistant",
+    "agent": "assistant",
+}
+
 class GroqClient:
     """
     AI client for Groq provider.
@@ -24,47 +48,224 @@ class GroqClient:
     """
     
     _initialized = False
+    _init_lock = threading.Lock()
     _groq_client = None
+    _async_groq_client = None
+    _cache: "OrderedDict[str, str]" = OrderedDict()
+    _inflight: Dict[str, "asyncio.Future[str]"] = {}
+    _semaphore: Optional[asyncio.Semaphore] = None
+    _semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+    _request_times: "deque[float]" = deque()
     
     @classmethod
     def initialize(cls) -> None:
-        """Initialize Groq client."""
+        """Initialize Groq client. Safe to call from several threads at once."""
         if cls._initialized:
             return
         
-        try:
-            from groq import Groq
-        except ImportError:
-            raise ImportError("Groq SDK not installed. Run: pip install groq")
-        
-        api_key = settings.groq_api_key
-        if not api_key:
-            raise ValueError(
-                "GROQ_API_KEY not found in environment. "
-                "Please set it in your .env file. "
-                "Get your free API key from: https://console.groq.com/"
-            )
-        
-        cls._groq_client = Groq(api_key=api_key)
-        print(f"[GroqClient] Initialized Groq with models: {settings.pro_model}, {settings.flash_model}")
-        
-        cls._initialized = True
+        with cls._init_lock:
+            if cls._initialized:
+                return
+            
+            try:
+                from groq import Groq, AsyncGroq
+            except ImportError:
+                raise ImportError("Groq SDK not installed. Run: pip install groq") from None
+            
+            api_key = settings.groq_api_key
+            if not api_key:
+                raise ValueError(
+                    "GROQ_API_KEY not found in environment. "
+                    "Please set it in your .env file. "
+                    "Get your free API key from: https://console.groq.com/"
+                )
+            
+            cls._groq_client = Groq(api_key=api_key)
+            cls._async_groq_client = AsyncGroq(api_key=api_key)
+            logger.info("[GroqClient] Initialized Groq with models: {}, {}", settings.pro_model, settings.flash_model)
+            
+            cls._initialized = True
     
     @classmethod
-    def get_client(cls):
-        """Get the underlying Groq client."""
+    def _ensure_init(cls) -> None:
+        """Initialize on first use; a plain flag check once the client exists."""
         if not cls._initialized:
             cls.initialize()
+    
+    @classmethod
+    def get_client(cls):
+        """Get the underlying synchronous Groq client."""
+        cls._ensure_init()
         return cls._groq_client
     
+    @staticmethod
+    def _cache_key(request: Dict[str, Any]) -> str:
+        """Build a stable SHA-256 key for a completion request payload."""
+        payload = json.dumps(request, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    @classmethod
+    def _should_cache(cls, temperature: Optional[float], use_cache: bool) -> bool:
+        """Only cache deterministic requests unless the caller opts in."""
+        return settings.enable_llm_cache and (temperature == 0 or use_cache)
+    
+    @classmethod
+    def _cache_get(cls, key: str) -> Optional[str]:
+        """Return a cached response and mark it as recently used."""
+        value = cls._cache.get(key)
+        if value is not None:
+            cls._cache.move_to_end(key)
+        return value
+    
+    @classmethod
+    def _cache_put(cls, key: str, value: str) -> None:
+        """Store a response, evicting the least recently used entry when full."""
+        cls._cache[key] = value
+        cls._cache.move_to_end(key)
+        while len(cls._cache) > settings.llm_cache_max_entries:
+            cls._cache.popitem(last=False)
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all cached responses."""
+        cls._cache.clear()
+    
+    @staticmethod
+    def _to_groq_messages(messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Convert agent messages to Groq format; unknown roles are sent as user turns."""
+        return [
+            {"role": _ROLE_MAP.get(msg.get("role", "user"), "user"), "content": msg.get("content", "")}
+            for msg in messages
+        ]
+    
+    @staticmethod
+    def _with_system(system_instruction: Optional[str], messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Prepend the system instruction, if any, to an already converted message list."""
+        if not system_instruction:
+            return messages
+        return [{"role": "system", "content": system_instruction}, *messages]
+    
+    @classmethod
+    def _prompt_messages(cls, prompt: str, system_instruction: Optional[str]) -> List[Dict[str, str]]:
+        """Build the message list for a single-prompt request."""
+        return cls._with_system(system_instruction, [{"role": "user", "content": prompt}])
+    
+    @classmethod
+    def _get_semaphore(cls) -> asyncio.Semaphore:
+        """Return the request limiter for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if cls._semaphore is None or cls._semaphore_loop is not loop:
+            cls._semaphore = asyncio.Semaphore(settings.max_concurrent_llm_requests)
+            cls._semaphore_loop = loop
+        return cls._semaphore
+    
+    @classmethod
+    async def _wait_for_rate_slot(cls) -> None:
+        """Block until sending one more request stays within llm_requests_per_minute."""
+        limit = settings.llm_requests_per_minute
+        if limit <= 0:
+            return
+        while True:
+            now = time.monotonic()
+            while cls._request_times and now - cls._request_times[0] >= 60:
+                cls._request_times.popleft()
+            if len(cls._request_times) < limit:
+                cls._request_times.append(now)
+                return
+            await asyncio.sleep(60 - (now - cls._request_times[0]))
+    
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, or None if the error is not a rate limit."""
+        if getattr(error, "status_code", None) != 429:
+            return None
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            return float(2 ** attempt)
+    
+    @classmethod
+    async def _complete(cls, request: Dict[str, Any]):
+        """
+        Run a chat completion under the concurrency limit, backing off on 429s.
+        
+        The request payload is built once by the caller and reused unchanged on every retry.
+        """
+        async with cls._get_semaphore():
+            for attempt in range(settings.llm_rate_limit_retries + 1):
+                await cls._wait_for_rate_slot()
+                try:
+                    return await cls._async_groq_client.chat.completions.create(**request)
+                except Exception as e:
+                    delay = cls._retry_delay(e, attempt)
+                    if delay is None or attempt == settings.llm_rate_limit_retries:
+                        raise
+                    logger.warning("[GroqClient] Rate limited, retrying in {:.1f}s", delay)
+                    await asyncio.sleep(delay)
+    
+    @staticmethod
+    def _build_request(model_name: str, messages: List[Dict[str, str]], **options: Any) -> Dict[str, Any]:
+        """Assemble a completion payload, leaving out options set to None so the server default applies."""
+        request = {"model": model_name, "messages": messages}
+        request.update({key: value for key, value in options.items() if value is not None})
+        return request
+    
+    @classmethod
+    async def _generate(
+        cls,
+        model_name: str,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        use_cache: bool,
+        response_format: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Complete a prepared message list, serving cacheable requests from cache or an in-flight twin."""
+        request = cls._build_request(
+            model_name,
+            messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format=response_format,
+        )
+        
+        if not cls._should_cache(temperature, use_cache):
+            response = await cls._complete(request)
+            return response.choices[0].message.content
+        
+        cache_key = cls._cache_key(request)
+        cached = cls._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Identical cacheable requests issued concurrently share one API call
+        pending = cls._inflight.get(cache_key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        
+        async def fetch() -> str:
+            response = await cls._complete(request)
+            content = response.choices[0].message.content
+            if content is not None:
+                cls._cache_put(cache_key, content)
+            return content
+        
+        task = asyncio.ensure_future(fetch())
+        cls._inflight[cache_key] = task
+        task.add_done_callback(lambda _: cls._inflight.pop(cache_key, None))
+        return await asyncio.shield(task)
+    
     @classmethod
     async def generate_text(
         cls,
         prompt: str,
         model_type: str = "flash",
-        temperature: float = 0.7,
-        max_tokens: int = 1024,
-        system_instruction: Optional[str] = None
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        system_instruction: Optional[str] = None,
+        use_cache: bool = False,
+        response_format: Optional[Dict[str, Any]] = None
     ) -> str:
         """
         Generate text using Groq.
@@ -72,45 +273,99 @@ class GroqClient:
         Args:
             prompt: The prompt to send to the model
             model_type: "pro" or "flash" (default: "flash")
-            temperature: Sampling temperature (0.0 to 1.0)
-            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature (0.0 to 1.0); None uses the server default
+            max_tokens: Maximum tokens to generate; None uses the server default
             system_instruction: Optional system instruction for the model
+            use_cache: Cache the response even when temperature > 0
+            response_format: Optional structured output mode, e.g. {"type": "json_object"}
             
         Returns:
             Generated text response
         """
-        if not cls._initialized:
-            cls.initialize()
+        cls._ensure_init()
         
         model_name = settings.pro_model if model_type == "pro" else settings.flash_model
         
         try:
-            messages = []
-            if system_instruction:
-                messages.append({"role": "system", "content": system_instruction})
-            messages.append({"role": "user", "content": prompt})
+            messages = cls._prompt_messages(prompt, system_instruction)
             
-            response = cls._groq_client.chat.completions.create(
-                model=model_name,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
-            
-            return response.choices[0].message.content
+            return await cls._generate(model_name, messages, temperature, max_tokens, use_cache, response_format)
             
         except Exception as e:
-            print(f"[GroqClient] Groq error: {e}")
+            logger.error("[GroqClient] Groq error: {}", e)
             raise
     
+    @classmethod
+    async def generate_json(
+        cls,
+        prompt: str,
+        model_type: str = "flash",
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        system_instruction: Optional[str] = None,
+        use_cache: bool = False
+    ) -> Any:
+        """
+        Generate a JSON object using Groq's JSON mode.
+        
+        The prompt (or system instruction) must ask for JSON explicitly, as Groq requires.
+        
+        Args:
+            prompt: The prompt to send to the model
+            model_type: "pro" or "flash" (default: "flash")
+            temperature: Sampling temperature (0.0 to 1.0); None uses the server default
+            max_tokens: Maximum tokens to generate; None uses the server default
+            system_instruction: Optional system instruction for the model
+            use_cache: Cache the response even when temperature > 0
+            
+        Returns:
+            Decoded JSON value
+        """
+        text = await cls.generate_text(
+            prompt,
+            model_type=model_type,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            system_instruction=system_instruction,
+            use_cache=use_cache,
+            response_format={"type": "json_object"},
+        )
+        return orjson.loads(text) if orjson is not None else json.loads(text)
+    
+    @classmethod
+    async def generate_many(
+        cls,
+        prompts: List[str],
+        model_type: str = "flash",
+        **kwargs: Any
+    ) -> List[Any]:
+        """
+        Generate text for several independent prompts concurrently.
+        
+        Requests still pass through the shared concurrency limiter.
+        
+        Args:
+            prompts: Prompts to send to the model
+            model_type: "pro" or "flash" (default: "flash")
+            **kwargs: Extra arguments forwarded to generate_text
+            
+        Returns:
+            Responses in prompt order; failed requests return their exception in place
+        """
+        return await asyncio.gather(
+            *(cls.generate_text(prompt, model_type=model_type, **kwargs) for prompt in prompts),
+            return_exceptions=True,
+        )
+    
     @classmethod
     async def generate_with_context(
         cls,
         messages: List[Dict[str, str]],
         model_type: str = "flash",
-        temperature: float = 0.7,
-        max_tokens: int = 1024,
-        system_instruction: Optional[str] = None
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        system_instruction: Optional[str] = None,
+        use_cache: bool = False
     ) -> str:
         """
         Generate text with conversation context using Groq.
@@ -118,47 +373,66 @@ class GroqClient:
         Args:
             messages: List of message dicts with 'role' and 'content' keys
             model_type: "pro" or "flash"
-            temperature: Sampling temperature
-            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature; None uses the server default
+            max_tokens: Maximum tokens to generate; None uses the server default
             system_instruction: Optional system instruction
+            use_cache: Cache the response even when temperature > 0
             
         Returns:
             Generated text response
         """
-        if not cls._initialized:
-            cls.initialize()
+        cls._ensure_init()
         
         model_name = settings.pro_model if model_type == "pro" else settings.flash_model
         
         try:
-            # Convert messages to Groq format
-            groq_messages = []
-            if system_instruction:
-                groq_messages.append({"role": "system", "content": system_instruction})
+            groq_messages = cls._with_system(system_instruction, cls._to_groq_messages(messages))
             
-            for msg in messages:
-                role = msg.get("role", "user")
-                content = msg.get("content", "")
-                
-                # Map roles to standard format
-                if role in ["user", "human"]:
-                    groq_role = "user"
-                elif role in ["assistant", "model", "game_master", "agent"]:
-                    groq_role = "assistant"
-                else:
-                    groq_role = "user"
-                
-                groq_messages.append({"role": groq_role, "content": content})
+            return await cls._generate(model_name, groq_messages, temperature, max_tokens, use_cache)
             
-            response = cls._groq_client.chat.completions.create(
-                model=model_name,
-                messages=groq_messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
-            
-            return response.choices[0].message.content
+        except Exception as e:
+            logger.error("[GroqClient] Groq context error: {}", e)
+            raise
+    
+    @classmethod
+    async def generate_text_stream(
+        cls,
+        prompt: str,
+        model_type: str = "flash",
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        system_instruction: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream generated text from Groq as it is produced.
+        
+        Args:
+            prompt: The prompt to send to the model
+            model_type: "pro" or "flash" (default: "flash")
+            temperature: Sampling temperature (0.0 to 1.0); None uses the server default
+            max_tokens: Maximum tokens to generate; None uses the server default
+            system_instruction: Optional system instruction for the model
             
+        Yields:
+            Text deltas in generation order
+        """
+        cls._ensure_init()
+        
+        model_name = settings.pro_model if model_type == "pro" else settings.flash_model
+        
+        messages = cls._prompt_messages(prompt, system_instruction)
+        
+        try:
+            async with cls._get_semaphore():
+                await cls._wait_for_rate_slot()
+                stream = await cls._async_groq_client.chat.completions.create(
+                    **cls._build_request(model_name, messages, temperature=temperature, max_tokens=max_tokens),
+                    stream=True,
+                )
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+        
         except Exception as e:
-            print(f"[GroqClient] Groq context error: {e}")
+            logger.error("[GroqClient] Groq stream error: {}", e)
             raise
@@ -8,11 +8,16 @@ for session management, agent communication, and evaluation tracking.
 from datetime import datetime, timezone
 from enum import Enum
 from typing import List, Dict, Any, Optional, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, TypeAdapter, computed_field, model_validator
 import uuid
 import time
 
 
+# Shared config for the models built on every turn: unknown keys are dropped and
+# attribute assignment (e.g. in add_message) is not re-validated.
+_MODEL_CONFIG = ConfigDict(extra="ignore", validate_assignment=False)
+
+
 class ThreatType(str, Enum):
     """Types of cybersecurity threats that can be simulated."""
     PHISHING = "phishing"
@@ -51,11 +56,19 @@ class UserRole(str, Enum):
     GENERAL = "general"
 
 
+# Plain dict lookups for the enum values parsed on every session creation
+USER_ROLE_BY_STR: Dict[str, UserRole] = {role.value: role for role in UserRole}
+DIFFICULTY_BY_INT: Dict[int, DifficultyLevel] = {level.value: level for level in DifficultyLevel}
+
+
 class DecisionPoint(BaseModel):
     """
     Records a key decision point made by the user during a scenario.
     Used for invisible assessment and learning analytics.
     """
+
+    model_config = _MODEL_CONFIG
+
     turn: int = Field(..., description="Conversation turn number when decision was made")
     vulnerability: str = Field(..., description="Type of vulnerability being tested")
     user_choice: str = Field(..., description="What the user chose to do")
@@ -70,6 +83,9 @@ class AgentMessage(BaseModel):
     Standardized message format for Agent-to-Agent (A2A) communication.
     Used by Game Master to coordinate with specialized threat actors.
     """
+
+    model_config = _MODEL_CONFIG
+
     sender_agent: str = Field(..., description="Name of the sending agent")
     recipient_agent: str = Field(..., description="Name of the receiving agent")
     message_type: str = Field(..., description="Type of message (activate_scenario, scenario_ready, etc.)")
@@ -84,6 +100,9 @@ class ScenarioContext(BaseModel):
     Context information passed to threat actor agents for scenario generation.
     Contains user profile and session state for personalization.
     """
+
+    model_config = _MODEL_CONFIG
+
     user_role: UserRole = Field(..., description="User's job function for scenario personalization")
     difficulty_level: DifficultyLevel = Field(..., description="Current difficulty setting")
     threat_pattern: SocialEngineeringPattern = Field(..., description="Primary social engineering pattern to use")
@@ -97,6 +116,9 @@ class CyberGuardSession(BaseModel):
     Main session object tracking state across a complete training scenario.
     Manages conversation history, decision tracking, and agent coordination.
     """
+
+    model_config = _MODEL_CONFIG
+
     session_id: str = Field(default_factory=lambda: str(uuid.uuid4()), description="Unique session identifier")
     user_id: str = Field(..., description="Anonymized user identifier")
     scenario_type: ThreatType = Field(..., description="Type of threat being simulated")
@@ -124,22 +146,54 @@ class CyberGuardSession(BaseModel):
     
     # Metadata
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), description="Session creation timestamp")
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), description="Last update timestamp")
+    updated_at_ts: float = Field(default_factory=time.time, description="Unix timestamp of last update")
+    
+    # (start_time, end_time, duration) memo for completed sessions; not serialized
+    _duration_cache: Optional[tuple] = PrivateAttr(default=None)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _accept_updated_at(cls, data: Any) -> Any:
+        """Map a serialized or caller-supplied updated_at onto updated_at_ts."""
+        if isinstance(data, dict) and "updated_at" in data:
+            data = dict(data)
+            updated_at = data.pop("updated_at")
+            if "updated_at_ts" not in data and updated_at is not None:
+                if isinstance(updated_at, str):
+                    updated_at = datetime.fromisoformat(updated_at)
+                data["updated_at_ts"] = updated_at.timestamp() if isinstance(updated_at, datetime) else float(updated_at)
+        return data
+
+    @computed_field(description="Last update timestamp")
+    @property
+    def updated_at(self) -> datetime:
+        """Last update time, materialized from updated_at_ts on access."""
+        return datetime.fromtimestamp(self.updated_at_ts, tz=timezone.utc)
+
+    @updated_at.setter
+    def updated_at(self, value: datetime) -> None:
+        self.updated_at_ts = value.timestamp()
 
     def add_message(self, role: str, content: str) -> None:
         """Add a conversation message and update timestamp."""
         self.conversation_history.append({"role": role, "content": content})
-        self.updated_at = datetime.now(timezone.utc)
+        self.updated_at_ts = time.time()
 
     def record_decision(self, decision: DecisionPoint) -> None:
         """Record a user decision point for evaluation."""
         self.decision_points.append(decision)
-        self.updated_at = datetime.now(timezone.utc)
+        self.updated_at_ts = time.time()
 
     def calculate_session_duration(self) -> float:
         """Calculate total session duration in seconds."""
-        end = self.end_time or time.time()
-        return end - self.start_time
+        if self.end_time is None:
+            return time.time() - self.start_time
+        cached = self._duration_cache
+        if cached is not None and cached[0] == self.start_time and cached[1] == self.end_time:
+            return cached[2]
+        duration = self.end_time - self.start_time
+        self._duration_cache = (self.start_time, self.end_time, duration)
+        return duration
 
     def get_recent_patterns(self, limit: int = 5) -> List[str]:
         """Get recently used patterns to avoid repetition."""
@@ -211,4 +265,13 @@ class EvaluationResult(BaseModel):
     
     # Metadata
     evaluated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), description="When evaluation was performed")
-    evaluator_version: str = Field(default="1.0", description="Version of evaluation algorithm used")
\ No newline at end of file
+    evaluator_version: str = Field(default="1.0", description="Version of evaluation algorithm used")
+
+
+# Built once at import so the first cold-path load in a worker doesn't pay for it
+_SESSION_ADAPTER = TypeAdapter(CyberGuardSession)
+
+
+def load_session_json(data: Union[str, bytes]) -> CyberGuardSession:
+    """Validate a serialized CyberGuardSession (e.g. from the Redis cache or an A2A payload)."""
+    return _SESSION_ADAPTER.validate_json(data)
@@ -7,13 +7,15 @@ and handles user interactions.
 """
 
 import asyncio
-from typing import Optional, Dict, Any
-from datetime import datetime
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List
 from loguru import logger
 
 # Core imports
 from cyberguard.config import settings
 from cyberguard.groq_client import GroqClient
+from cyberguard.redis_cache import RedisCache
 from cyberguard.models import (
     CyberGuardSession,
     ScenarioContext,
@@ -21,7 +23,9 @@ from cyberguard.models import (
     DifficultyLevel,
     SocialEngineeringPattern,
     DecisionPoint,
-    AgentMessage
+    AgentMessage,
+    USER_ROLE_BY_STR,
+    DIFFICULTY_BY_INT
 )
 
 # Agent imports
@@ -59,10 +63,28 @@ class CyberGuardOrchestrator:
         # Initialize tools
         self.session_manager = SessionManager()
         self.user_profiler = UserProfiler()
+        self.cache = RedisCache()
         
         # System state
         self.initialized = False
-        self.active_sessions: Dict[str, CyberGuardSession] = {}
+        self.active_sessions: "OrderedDict[str, CyberGuardSession]" = OrderedDict()  # LRU order
+        self._session_reaper: Optional[asyncio.Task] = None
+        self._pending_decisions: Dict[str, List[DecisionPoint]] = {}
+        self._inflight_loads: Dict[str, "asyncio.Future[Optional[CyberGuardSession]]"] = {}
+        
+        # Write-behind for session files: session_id -> time it was first left unsaved
+        self._dirty_sessions: Dict[str, float] = {}
+        self._session_flusher: Optional[asyncio.Task] = None
+        
+        # Fire-and-forget evaluation events, consumed off the request path
+        self._evaluation_events: Optional[asyncio.Queue] = None
+        self._evaluation_worker: Optional[asyncio.Task] = None
+        # Per session: events still queued, and a future resolved once they are all delivered
+        self._queued_event_counts: Dict[str, int] = {}
+        self._events_delivered: Dict[str, asyncio.Future] = {}
+        
+        # Strong references to every background task this orchestrator starts
+        self._bg_tasks: "set[asyncio.Task]" = set()
         
     async def initialize(self) -> None:
         """Initialize all agents and tools."""
@@ -73,21 +95,25 @@ class CyberGuardOrchestrator:
         logger.info("Initializing all agents...")
         
         try:
-            # Initialize Groq client first
-            logger.info("Initializing Groq AI client...")
-            GroqClient.initialize()
-            
-            # Initialize agents in parallel for efficiency
+            # Initialize the Groq client, agents and tools in parallel; none depend on each other
+            # (GroqClient also initializes itself thread-safely on first use)
+            logger.info("Initializing Groq AI client, agents and tools...")
             await asyncio.gather(
+                asyncio.to_thread(GroqClient.initialize),
                 self.game_master.initialize(),
                 self.phishing_agent.initialize(),
                 self.evaluation_agent.initialize(),
-                self.memory_manager.initialize()
+                self.memory_manager.initialize(),
+                self.session_manager.initialize(),
+                self.user_profiler.initialize(),
+                self.cache.initialize()
             )
             
-            # Initialize tools
-            await self.session_manager.initialize()
-            await self.user_profiler.initialize()
+            # Start background consumer for evaluation events
+            self._evaluation_events = asyncio.Queue()
+            self._evaluation_worker = self._spawn(self._run_evaluation_worker())
+            self._session_reaper = self._spawn(self._reap_idle_sessions())
+            self._session_flusher = self._spawn(self._flush_dirty_sessions_periodically())
             
             self.initialized = True
             logger.success("✅ All agents and tools initialized successfully")
@@ -104,22 +130,54 @@ class CyberGuardOrchestrator:
             return
         
         try:
-            # Complete all active sessions
-            for session_id in list(self.active_sessions.keys()):
-                logger.info(f"Completing active session: {session_id}")
-                await self.complete_scenario(session_id, reason="system_shutdown")
+            # Complete all active sessions, a bounded number at a time (each may call the LLM)
+            completion_slots = asyncio.Semaphore(settings.max_concurrent_llm_requests)
+            
+            async def complete_on_shutdown(session_id: str) -> None:
+                async with completion_slots:
+                    logger.info(f"Completing active session: {session_id}")
+                    await self.complete_scenario(session_id, reason="system_shutdown")
+            
+            await asyncio.gather(*(complete_on_shutdown(sid) for sid in list(self.active_sessions)))
             
-            # Shutdown agents in parallel
+            if self._session_reaper is not None:
+                self._session_reaper.cancel()
+                await asyncio.gather(self._session_reaper, return_exceptions=True)
+                self._session_reaper = None
+            
+            # Stop write-behind and save anything still dirty
+            if self._session_flusher is not None:
+                self._session_flusher.cancel()
+                await asyncio.gather(self._session_flusher, return_exceptions=True)
+                self._session_flusher = None
+            await self._flush_dirty_sessions(max_age=0)
+            
+            # Drain and stop the evaluation event consumer
+            if self._evaluation_worker is not None:
+                drained = asyncio.ensure_future(self._evaluation_events.join())
+                await self._await_evaluation_delivery(drained, "shutdown")
+                drained.cancel()
+                self._evaluation_worker.cancel()
+                await asyncio.gather(self._evaluation_worker, return_exceptions=True)
+                self._evaluation_worker = None
+            
+            # Anything else still running in the background
+            for task in self._bg_tasks:
+                task.cancel()
+            await asyncio.gather(*self._bg_tasks, return_exceptions=True)
+            
+            # Shutdown agents and tools in parallel
             await asyncio.gather(
                 self.game_master.shutdown(),
                 self.phishing_agent.shutdown(),
                 self.evaluation_agent.shutdown(),
-                self.memory_manager.shutdown()
+                self.memory_manager.shutdown(),
+                self.user_profiler.shutdown(),
+                self.cache.shutdown()
             )
             
-            # Shutdown tools
+            # Written last so this registry wins over the Memory Manager's copy of the same file
             await self.session_manager.shutdown()
-            await self.user_profiler.shutdown()
             
             self.initialized = False
             logger.success("✅ Orchestrator shutdown complete")
@@ -153,7 +211,7 @@ class CyberGuardOrchestrator:
             raise RuntimeError("Orchestrator not initialized. Call initialize() first.")
         
         # Load user profile for personalization
-        user_profile = await self.user_profiler._load_profile(user_id)
+        user_profile = await self._get_cached_profile(user_id)
         
         # Handle case where profile doesn't exist yet (new user)
         if user_profile is None:
@@ -170,8 +228,8 @@ class CyberGuardOrchestrator:
         
         # Create scenario context
         context = ScenarioContext(
-            user_role=UserRole(user_role),
-            difficulty_level=DifficultyLevel(difficulty),
+            user_role=USER_ROLE_BY_STR.get(user_role, UserRole.GENERAL),
+            difficulty_level=DIFFICULTY_BY_INT.get(difficulty) or DifficultyLevel(difficulty),
             threat_pattern=SocialEngineeringPattern.URGENCY,  # Will be selected by Game Master
             recently_seen_patterns=user_profile.get("recent_patterns", []),
             vulnerability_areas=user_profile.get("vulnerability_areas", [])
@@ -184,12 +242,12 @@ class CyberGuardOrchestrator:
             context=context
         )
         
-        # Store session
-        self.active_sessions[session.session_id] = session
-        await self.session_manager.save_session(session)
-        
-        # Notify evaluation agent of new session
-        await self._notify_evaluation_agent("session_started", session)
+        # Store session and notify the evaluation agent; independent once the session exists
+        await self._remember_session(session)
+        await asyncio.gather(
+            self._persist_session(session),
+            self._notify_evaluation_agent("session_started", session)
+        )
         
         logger.success(f"✅ Session {session.session_id} created successfully")
         return session
@@ -214,16 +272,14 @@ class CyberGuardOrchestrator:
         logger.info(f"Processing user action in session {session_id}: {action_type}")
         
         # Retrieve session
-        session = self.active_sessions.get(session_id)
+        session = await self._lookup_session(session_id)
         if not session:
-            # Try loading from storage
-            session = await self.session_manager.load_session(session_id)
-            if not session:
-                raise ValueError(f"Session {session_id} not found")
-            self.active_sessions[session_id] = session
+            raise ValueError(f"Session {session_id} not found")
+        await self._remember_session(session)
         
         # Add user message to conversation history
         session.add_message("user", user_message)
+        decisions_before = len(session.decision_points)
         
         # Process through Game Master - pass session object directly to avoid stale copies
         # Game Master will analyze the response and create decision points with proper evaluation data
@@ -237,21 +293,29 @@ class CyberGuardOrchestrator:
         narrative = response.get("content", response.get("narrative", ""))
         response["narrative"] = narrative
         
-        # Get the latest decision point if one was recorded by Game Master
-        decision_point = session.decision_points[-1] if session.decision_points else None
+        # Only decisions the Game Master recorded on this turn; conversational turns add none
+        new_decisions = session.decision_points[decisions_before:]
         
-        # Send decision to evaluation agent (invisible assessment) if there was a decision
-        if decision_point:
-            await self._notify_evaluation_agent("decision_made", session, decision_point)
+        scenario_complete = response.get("scenario_complete", False)
         
-        # Update session storage
-        await self.session_manager.save_session(session)
+        # Buffer the decisions for the evaluation agent (invisible assessment); flushed in batches
+        if new_decisions:
+            self._pending_decisions.setdefault(session_id, []).extend(new_decisions)
+        
+        # Notify and persist are independent once the Game Master has updated the session.
+        # A completing session skips both: complete_scenario flushes and saves it anyway.
+        if not scenario_complete:
+            updates = [self._persist_session(session)]
+            if len(self._pending_decisions.get(session_id, ())) >= settings.decision_batch_size:
+                updates.append(self._flush_decisions(session))
+            await asyncio.gather(*updates)
         
         # Check if scenario is complete
-        if response.get("scenario_complete", False):
+        if scenario_complete:
             logger.info(f"Scenario complete for session {session_id}")
-            await self.complete_scenario(session_id)
-            response["debrief"] = await self._generate_debrief(session)
+            completion = await self.complete_scenario(session_id)
+            response["debrief"] = completion["debrief"]
+            response["evaluation"] = completion["evaluation"]
         
         return response
     
@@ -273,14 +337,18 @@ class CyberGuardOrchestrator:
         logger.info(f"Completing scenario {session_id}: {reason}")
         
         # Retrieve session
-        session = self.active_sessions.get(session_id)
+        session = await self._lookup_session(session_id)
         if not session:
-            session = await self.session_manager.load_session(session_id)
-            if not session:
-                raise ValueError(f"Session {session_id} not found")
+            raise ValueError(f"Session {session_id} not found")
+        
+        # Deliver any buffered decisions and wait for this session's queued events before evaluating
+        await self._flush_decisions(session)
+        delivered = self._events_delivered.get(session_id)
+        if delivered is not None:
+            await self._await_evaluation_delivery(delivered, f"session {session_id}")
         
         # Mark session as complete
-        session.end_time = datetime.now().timestamp()
+        session.end_time = time.time()
         session.current_state = "completed"
         session.is_active = False
         
@@ -291,7 +359,7 @@ class CyberGuardOrchestrator:
             message_type="evaluate_session",
             session_id=session_id,
             payload={
-                "session": session.model_dump(mode='json'),
+                "session": session,  # same process: hand over the object rather than a dump to re-parse
                 "completion_reason": reason
             }
         )
@@ -299,18 +367,19 @@ class CyberGuardOrchestrator:
         evaluation_response = await self.evaluation_agent.process_message(evaluation_message)
         evaluation_data = evaluation_response.payload
         
-        # Update user profile with evaluation results
-        await self._update_user_profile(session, evaluation_data)
-        
-        # Generate debrief
-        debrief = await self._generate_debrief(session, evaluation_data)
-        
-        # Save final session state
-        await self.session_manager.save_session(session)
+        # Debrief, profile update and final save all only read the finished session
+        self._dirty_sessions.pop(session_id, None)
+        debrief, _, _ = await asyncio.gather(
+            self._generate_debrief(session, evaluation_data),
+            self._update_user_profile(session, evaluation_data),
+            self.session_manager.save_session(session)
+        )
         
         # Remove from active sessions
         if session_id in self.active_sessions:
             del self.active_sessions[session_id]
+        self.game_master.release_session(session_id)
+        await self.cache.delete_session(session_id)
         
         logger.success(f"✅ Scenario {session_id} completed successfully")
         
@@ -322,6 +391,228 @@ class CyberGuardOrchestrator:
             "completion_reason": reason
         }
     
+    def _spawn(self, coro) -> asyncio.Task:
+        """Start a background task and hold a reference to it until it finishes."""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+        return task
+    
+    async def get_session(self, session_id: str) -> Optional[CyberGuardSession]:
+        """
+        Look up a session by ID for read-only use.
+        
+        Goes through the same path as user actions (in-memory, shared cache, then
+        disk, with concurrent cold loads coalesced), but does not pull the session
+        into this process's active set.
+        """
+        return await self._lookup_session(session_id)
+    
+    async def _get_cached_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Read a user profile through the shared cache, falling back to the profile store."""
+        profile = await self.cache.get_profile(user_id)
+        if profile is None:
+            profile = await self.user_profiler._load_profile(user_id)
+            if profile is not None:
+                await self.cache.set_profile(user_id, profile)
+        return profile
+    
+    async def _lookup_session(self, session_id: str) -> Optional[CyberGuardSession]:
+        """
+        Find a session in this process, then the shared cache, then durable storage.
+        
+        With Redis enabled the shared cache is the source of truth: another worker
+        may have advanced the session since this process last touched it, so a
+        local copy is only used while Redis holds nothing newer.
+        """
+        session = self.active_sessions.get(session_id)
+        if session is not None:
+            if self.cache.enabled:
+                return await self._revalidate_session(session)
+            self.active_sessions.move_to_end(session_id)
+            return session
+        
+        # Concurrent requests for the same cold session share one load
+        pending = self._inflight_loads.get(session_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        
+        async def load() -> Optional[CyberGuardSession]:
+            loaded = await self.cache.get_session(session_id)
+            if loaded is None:
+                loaded = await self.session_manager.load_session(session_id)
+            return loaded
+        
+        task = asyncio.ensure_future(load())
+        self._inflight_loads[session_id] = task
+        task.add_done_callback(lambda _: self._inflight_loads.pop(session_id, None))
+        return await asyncio.shield(task)
+    
+    async def _revalidate_session(self, session: CyberGuardSession) -> CyberGuardSession:
+        """Return the shared cache's copy of a session if it is newer than the local one."""
+        shared = await self.cache.get_session(session.session_id)
+        if shared is None or shared.updated_at_ts <= session.updated_at_ts:
+            return session
+        logger.debug(f"Session {session.session_id} was updated by another worker, refreshing local copy")
+        if session.session_id in self.active_sessions:
+            self.active_sessions[session.session_id] = shared
+        return shared
+    
+    async def _remember_session(self, session: CyberGuardSession) -> None:
+        """Keep a session in the in-process LRU, persisting whatever falls off the end."""
+        self.active_sessions[session.session_id] = session
+        self.active_sessions.move_to_end(session.session_id)
+        while len(self.active_sessions) > settings.max_active_sessions:
+            _, evicted = self.active_sessions.popitem(last=False)
+            logger.debug(f"Evicting least recently used session {evicted.session_id}")
+            await self._evict_session(evicted)
+    
+    async def _evict_session(self, session: CyberGuardSession) -> None:
+        """Hand an evicted session's buffered decisions and state off before this process forgets it."""
+        self._dirty_sessions.pop(session.session_id, None)
+        self.game_master.release_session(session.session_id)
+        await self._flush_decisions(session)
+        await self.session_manager.save_session(session)
+    
+    async def _reap_idle_sessions(self) -> None:
+        """Periodically persist and drop sessions idle longer than the session timeout."""
+        idle_timeout = settings.session_timeout_minutes * 60
+        while True:
+            await asyncio.sleep(settings.session_reaper_interval_seconds)
+            cutoff = time.time() - idle_timeout
+            idle = [s for s in self.active_sessions.values() if s.updated_at_ts < cutoff]
+            for session in idle:
+                logger.info(f"Evicting idle session {session.session_id}")
+                self.active_sessions.pop(session.session_id, None)
+                try:
+                    await self._evict_session(session)
+                except Exception as e:
+                    logger.error(f"Failed to persist idle session {session.session_id}: {e}")
+    
+    async def _persist_session(self, session: CyberGuardSession) -> None:
+        """
+        Store session state for other workers.
+        
+        With Redis configured, in-progress turns live only in the shared cache and
+        the JSON file is written once the session ends. Otherwise the new turn is
+        appended to the session's turn log and the session is marked dirty; the
+        background flusher later folds the log into a single full snapshot.
+        """
+        await self.cache.set_session(session)
+        if self.cache.enabled and session.is_active:
+            return
+        if session.is_active and self._session_flusher is not None and not self._session_flusher.done():
+            await self.session_manager.append_turn(session)
+            self._dirty_sessions.setdefault(session.session_id, time.time())
+            return
+        self._dirty_sessions.pop(session.session_id, None)
+        await self.session_manager.save_session(session)
+    
+    async def _flush_dirty_sessions(self, max_age: float) -> None:
+        """Save in-memory sessions that have been dirty for at least max_age seconds."""
+        cutoff = time.time() - max_age
+        due = [sid for sid, since in self._dirty_sessions.items() if since <= cutoff]
+        for session_id in due:
+            self._dirty_sessions.pop(session_id, None)
+            session = self.active_sessions.get(session_id)
+            if session is None:
+                continue
+            try:
+                await self.session_manager.save_session(session)
+            except Exception as e:
+                logger.error(f"Failed to flush session {session_id}: {e}")
+                self._dirty_sessions.setdefault(session_id, time.time())
+    
+    async def _flush_dirty_sessions_periodically(self) -> None:
+        """Background write-behind loop for dirty sessions."""
+        while True:
+            await asyncio.sleep(settings.session_flush_interval_seconds)
+            await self._flush_dirty_sessions(settings.session_flush_delay_seconds)
+    
+    async def _publish_evaluation_event(self, message: AgentMessage) -> None:
+        """Queue a notification for the evaluation agent, or deliver inline if no consumer is running."""
+        if self._evaluation_worker is None or self._evaluation_worker.done():
+            await self.evaluation_agent.process_message(message)
+            return
+        session_id = message.session_id
+        self._queued_event_counts[session_id] = self._queued_event_counts.get(session_id, 0) + 1
+        if session_id not in self._events_delivered:
+            self._events_delivered[session_id] = asyncio.get_running_loop().create_future()
+        self._evaluation_events.put_nowait(message)
+    
+    def _mark_event_delivered(self, session_id: str) -> None:
+        """Count one queued event as handled, resolving the session's waiter after the last one."""
+        remaining = self._queued_event_counts.get(session_id, 1) - 1
+        if remaining > 0:
+            self._queued_event_counts[session_id] = remaining
+            return
+        self._queued_event_counts.pop(session_id, None)
+        delivered = self._events_delivered.pop(session_id, None)
+        if delivered is not None and not delivered.done():
+            delivered.set_result(None)
+    
+    async def _await_evaluation_delivery(self, waiter: asyncio.Future, what: str) -> None:
+        """Wait for queued evaluation events, giving up if the worker stops or the drain timeout passes."""
+        worker = self._evaluation_worker
+        if worker is None or waiter.done():
+            return
+        done, _ = await asyncio.wait(
+            {waiter, worker},
+            timeout=settings.evaluation_drain_timeout_seconds,
+            return_when=asyncio.FIRST_COMPLETED
+        )
+        if waiter not in done:
+            reason = "evaluation worker stopped" if worker.done() else "timed out"
+            logger.warning(f"Not waiting for queued evaluation events ({what}): {reason}")
+    
+    async def _run_evaluation_worker(self) -> None:
+        """Deliver queued evaluation events in batches so user turns never wait on assessment."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._evaluation_events.get()]
+            
+            # Collect whatever else arrives within the batch window
+            deadline = loop.time() + settings.evaluation_batch_window_ms / 1000
+            while len(batch) < settings.evaluation_batch_max_events:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._evaluation_events.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                await self.evaluation_agent.process_message(self._build_evaluation_batch(batch))
+            except Exception as e:
+                logger.error(f"Evaluation batch of {len(batch)} event(s) failed: {e}")
+            finally:
+                for message in batch:
+                    self._evaluation_events.task_done()
+                    self._mark_event_delivered(message.session_id)
+    
+    @staticmethod
+    def _build_evaluation_batch(batch: List[AgentMessage]) -> AgentMessage:
+        """Wrap several queued events into one evaluate_batch message (single events pass through)."""
+        if len(batch) == 1:
+            return batch[0]
+        return AgentMessage(
+            sender_agent="orchestrator",
+            recipient_agent="evaluation_agent",
+            message_type="evaluate_batch",
+            session_id=batch[0].session_id,
+            payload={
+                "events": [
+                    {
+                        "message_type": message.message_type,
+                        "session_id": message.session_id,
+                        "payload": message.payload
+                    }
+                    for message in batch
+                ]
+            }
+        )
+    
     async def _notify_evaluation_agent(
         self,
         event_type: str,
@@ -342,7 +633,28 @@ class CyberGuardOrchestrator:
             }
         )
         
-        await self.evaluation_agent.process_message(message)
+        await self._publish_evaluation_event(message)
+    
+    async def _flush_decisions(self, session: CyberGuardSession) -> None:
+        """Send all buffered decisions for a session to the evaluation agent in one message."""
+        batch = self._pending_decisions.pop(session.session_id, None)
+        if not batch:
+            return
+        
+        message = AgentMessage(
+            sender_agent="orchestrator",
+            recipient_agent="evaluation_agent",
+            message_type="decisions_made",
+            session_id=session.session_id,
+            payload={
+                "session_id": session.session_id,
+                "user_id": session.user_id,
+                "scenario_type": session.scenario_type.value,
+                "decisions": [decision.model_dump() for decision in batch]
+            }
+        )
+        
+        await self._publish_evaluation_event(message)
     
     async def _update_user_profile(
         self,
@@ -359,11 +671,17 @@ class CyberGuardOrchestrator:
                 "user_id": session.user_id,
                 "session_id": session.session_id,
                 "evaluation": evaluation_data,
-                "session_data": session.model_dump()
+                # Only what the profile update needs; the full transcript is not copied
+                "decision_points": [decision.model_dump() for decision in session.decision_points],
+                "duration": session.calculate_session_duration(),
+                "difficulty": session.current_difficulty.value
             }
         )
         
         await self.memory_manager.process_message(message)
+        
+        # Next read repopulates the cache with post-evaluation data
+        await self.cache.delete_profile(session.user_id)
     
     async def _generate_debrief(
         self,
@@ -379,7 +697,7 @@ class CyberGuardOrchestrator:
                 message_type="get_evaluation",
                 session_id=session.session_id,
                 payload={
-                    "session": session.model_dump(mode='json'),
+                    "session": session,
                     "session_id": session.session_id
                 }
             )
@@ -0,0 +1,183 @@
+"""
+Redis cache for CyberGuard Academy
+
+Optional shared cache that lets several API workers see the same
+in-flight sessions and user profiles. Disabled unless REDIS_URL is set;
+every operation degrades to a cache miss if Redis is unavailable.
+REDIS_URL may list several comma-separated nodes, in which case keys
+are sharded across them with a consistent-hash ring.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+from typing import Optional, Dict, Any, List, Tuple
+
+from loguru import logger
+
+from cyberguard.config import settings
+from cyberguard.models import CyberGuardSession, load_session_json
+
+
+class HashRing:
+    """
+    Consistent-hash ring mapping keys onto a fixed set of nodes.
+
+    Each node is placed at several virtual points so keys spread evenly,
+    and adding or removing a node only remaps the keys next to its points.
+    """
+
+    def __init__(self, nodes: List[str], replicas: int = 100):
+        self._points: List[Tuple[int, str]] = sorted(
+            (self._hash(f"{node}#{i}"), node)
+            for node in nodes
+            for i in range(replicas)
+        )
+        self._hashes = [point for point, _ in self._points]
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+    def get_node(self, key: str) -> str:
+        """Return the node responsible for a key."""
+        index = bisect.bisect(self._hashes, self._hash(key)) % len(self._points)
+        return self._points[index][1]
+
+
+class RedisCache:
+    """
+    Async Redis wrapper for session and profile caching.
+
+    Sessions are stored as JSON under ``sess:<session_id>`` and profiles
+    under ``profile:<user_id>``, each with its own TTL. With several nodes
+    configured, the session or user id picks the shard.
+    """
+
+    SESSION_PREFIX = "sess:"
+    PROFILE_PREFIX = "profile:"
+
+    def __init__(self, url: Optional[str] = None):
+        url = url if url is not None else settings.redis_url
+        self.urls = [u.strip() for u in url.split(",") if u.strip()]
+        self._clients: Dict[str, Any] = {}
+        self._ring: Optional[HashRing] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether Redis connections are configured and ready."""
+        return bool(self._clients)
+
+    async def initialize(self) -> None:
+        """Connect to every configured Redis node."""
+        if not self.urls or self._clients:
+            return
+
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            raise ImportError("Redis client not installed. Run: pip install redis") from None
+
+        clients = {url: aioredis.from_url(url, decode_responses=True) for url in self.urls}
+        try:
+            for client in clients.values():
+                await client.ping()
+        except Exception as e:
+            # A partial ring would route keys differently from other workers, so use none
+            logger.warning(f"[RedisCache] Redis unavailable at startup, caching disabled: {e}")
+            for client in clients.values():
+                await client.aclose()
+            return
+
+        self._clients = clients
+        self._ring = HashRing(self.urls)
+        logger.info(f"[RedisCache] Connected to {len(clients)} Redis node(s)")
+
+    async def shutdown(self) -> None:
+        """Close all Redis connections."""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients = {}
+        self._ring = None
+
+    def _shard(self, key: str):
+        """Return the client that owns a key, or None when caching is disabled."""
+        if not self._clients:
+            return None
+        if len(self._clients) == 1:
+            return next(iter(self._clients.values()))
+        return self._clients[self._ring.get_node(key)]
+
+    async def get_session(self, session_id: str) -> Optional[CyberGuardSession]:
+        """Fetch a cached session, or None on miss."""
+        redis = self._shard(session_id)
+        if redis is None:
+            return None
+        try:
+            raw = await redis.get(f"{self.SESSION_PREFIX}{session_id}")
+            return load_session_json(raw) if raw else None
+        except Exception as e:
+            logger.warning(f"[RedisCache] Session read failed for {session_id[:8]}...: {e}")
+            return None
+
+    async def set_session(self, session: CyberGuardSession) -> None:
+        """Cache a session with the configured session TTL."""
+        redis = self._shard(session.session_id)
+        if redis is None:
+            return
+        try:
+            await redis.set(
+                f"{self.SESSION_PREFIX}{session.session_id}",
+                session.model_dump_json(),
+                ex=settings.session_cache_ttl_seconds
+            )
+        except Exception as e:
+            logger.warning(f"[RedisCache] Session write failed for {session.session_id[:8]}...: {e}")
+
+    async def delete_session(self, session_id: str) -> None:
+        """Drop a session from the cache."""
+        redis = self._shard(session_id)
+        if redis is None:
+            return
+        try:
+            await redis.delete(f"{self.SESSION_PREFIX}{session_id}")
+        except Exception as e:
+            logger.warning(f"[RedisCache] Session delete failed for {session_id[:8]}...: {e}")
+
+    async def get_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch a cached user profile, or None on miss."""
+        redis = self._shard(user_id)
+        if redis is None:
+            return None
+        try:
+            raw = await redis.get(f"{self.PROFILE_PREFIX}{user_id}")
+            return json.loads(raw) if raw else None
+        except Exception as e:
+            logger.warning(f"[RedisCache] Profile read failed for {user_id[:8]}...: {e}")
+            return None
+
+    async def set_profile(self, user_id: str, profile: Dict[str, Any]) -> None:
+        """Cache a user profile with the configured profile TTL."""
+        redis = self._shard(user_id)
+        if redis is None:
+            return
+        try:
+            await redis.set(
+                f"{self.PROFILE_PREFIX}{user_id}",
+                json.dumps(profile, default=str),
+                ex=settings.profile_cache_ttl_seconds
+            )
+        except Exception as e:
+            logger.warning(f"[RedisCache] Profile write failed for {user_id[:8]}...: {e}")
+
+    async def delete_profile(self, user_id: str) -> None:
+        """Invalidate a cached user profile."""
+        redis = self._shard(user_id)
+        if redis is None:
+            return
+        try:
+            await redis.delete(f"{self.PROFILE_PREFIX}{user_id}")
+        except Exception as e:
+            logger.warning(f"[RedisCache] Profile delete failed for {user_id[:8]}...: {e}")
@@ -10,36 +10,77 @@ from typing import Optional
 from loguru import logger
 import uvicorn
 
+from cyberguard.config import settings
 from cyberguard.orchestrator import CyberGuardOrchestrator
+from cyberguard.redis_cache import RedisCache
 
 # Module-level orchestrator instance
 # Force reload trigger
 _orchestrator: Optional[CyberGuardOrchestrator] = None
+_orchestrator_lock = asyncio.Lock()
 
 
 async def get_orchestrator() -> CyberGuardOrchestrator:
     """Get or create the global orchestrator instance."""
     global _orchestrator
     
-    if _orchestrator is None:
-        _orchestrator = CyberGuardOrchestrator()
-        await _orchestrator.initialize()
+    # Fast path for every request after startup
+    if _orchestrator is not None:
+        return _orchestrator
+    
+    # Serialize creation so concurrent first requests share one initialized instance
+    async with _orchestrator_lock:
+        if _orchestrator is None:
+            orchestrator = CyberGuardOrchestrator()
+            await orchestrator.initialize()
+            _orchestrator = orchestrator
     
     return _orchestrator
 
 
+def _shared_cache_available() -> bool:
+    """Check that the Redis cache every worker would share is configured and answering."""
+    async def probe() -> bool:
+        cache = RedisCache()
+        try:
+            await cache.initialize()
+            return cache.enabled
+        except ImportError as e:
+            logger.error(f"❌ {e}")
+            return False
+        finally:
+            await cache.shutdown()
+    
+    return asyncio.run(probe())
+
+
 def main():
     """Main entry point to start the API server."""
     logger.info("🎯 Starting CyberGuard Academy")
     
     try:
-        # Run the API server directly
+        # Debug keeps the single-process auto-reloader; otherwise run api_workers workers.
+        # Each worker has its own orchestrator, so more than one is only safe when they
+        # share session state through a reachable Redis cache.
+        # loop/http "auto" pick uvloop and httptools when installed (uvicorn[standard]).
+        if settings.debug:
+            server_options = {"reload": True}
+        else:
+            if settings.api_workers > 1 and not _shared_cache_available():
+                raise SystemExit(
+                    f"API_WORKERS={settings.api_workers} needs a reachable REDIS_URL so workers share "
+                    "sessions; set REDIS_URL or run a single worker (API_WORKERS=1)"
+                )
+            server_options = {"workers": settings.api_workers}
+        
         uvicorn.run(
             "api:app",
-            host="0.0.0.0",
-            port=8000,
-            reload=True,
-            log_level="info"
+            host=settings.api_host,
+            port=settings.api_port,
+            loop="auto",
+            http="auto",
+            log_level="info",
+            **server_options
         )
         
     except KeyboardInterrupt:
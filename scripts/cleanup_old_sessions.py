@@ -4,22 +4,49 @@ Run this once to fix compatibility issues with old session data.
 """
 
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # declared dependency; stdlib json keeps bare checkouts working
+    orjson = None
+
+
+def migrate_session_file(session_file: Path) -> bool:
+    """Add is_active=False to one session file. Returns True if the file was rewritten."""
+    raw = session_file.read_bytes()
+    session_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+    # Only the top-level key counts: nested dicts such as threat_content or evaluation
+    # can carry their own "is_active", so a byte scan of the file cannot tell them apart
+    if "is_active" in session_data:
+        return False
+
+    # Add is_active field (set to False for old sessions)
+    session_data["is_active"] = False
+    if orjson is not None:
+        session_file.write_bytes(orjson.dumps(session_data, option=orjson.OPT_INDENT_2))
+    else:
+        session_file.write_text(json.dumps(session_data, indent=2, ensure_ascii=False), encoding="utf-8")
+    return True
+
+
 def cleanup_sessions():
     """Add is_active field to old session files."""
     # Determine project root (parent of scripts directory)
     script_dir = Path(__file__).parent.resolve()
     project_root = script_dir.parent
     sessions_dir = project_root / "data" / "sessions"
-    
+
     if not sessions_dir.exists():
         print("No sessions directory found.")
         return
-    
+
     updated_count = 0
     error_count = 0
-    
+
     # First, clear the active_sessions registry since we're marking all as inactive
     active_sessions_file = sessions_dir / "active_sessions.json"
     if active_sessions_file.exists():
@@ -29,31 +56,24 @@ def cleanup_sessions():
             print("✅ Cleared active_sessions registry")
         except Exception as e:
             print(f"❌ Error clearing active_sessions registry: {e}")
-    
-    for session_file in sessions_dir.glob("*.json"):
-        if session_file.name == "active_sessions.json":
-            continue
-            
-        try:
-            with open(session_file, 'r', encoding='utf-8') as f:
-                session_data = json.load(f)
-            
-            # Check if is_active field exists
-            if "is_active" not in session_data:
-                # Add is_active field (set to False for old sessions)
-                session_data["is_active"] = False
-                
-                # Save back to file
-                with open(session_file, 'w', encoding='utf-8') as f:
-                    json.dump(session_data, f, indent=2)
-                
-                updated_count += 1
-                print(f"✅ Updated: {session_file.name}")
-        
-        except Exception as e:
-            error_count += 1
-            print(f"❌ Error processing {session_file.name}: {e}")
-    
+
+    session_files = [
+        session_file for session_file in sessions_dir.glob("*.json")
+        if session_file.name != "active_sessions.json"
+    ]
+
+    # File I/O dominates, so threads overlap it; results are reported from the main thread
+    with ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 4) as executor:
+        futures = {executor.submit(migrate_session_file, f): f for f in session_files}
+        for future, session_file in futures.items():
+            try:
+                if future.result():
+                    updated_count += 1
+                    print(f"✅ Updated: {session_file.name}")
+            except Exception as e:
+                error_count += 1
+                print(f"❌ Error processing {session_file.name}: {e}")
+
     print(f"\n📊 Summary:")
     print(f"  - Updated: {updated_count} sessions")
     print(f"  - Errors: {error_count} sessions")
@@ -1,6 +1,20 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Session snapshots, interrupted atomic writes and turn logs
+SESSION_FILE_SUFFIXES = (".json", ".tmp", ".log")
+
+
+def _unlink(path: str):
+    """Delete one file, returning the error instead of raising so the pool keeps going."""
+    try:
+        os.unlink(path)
+        return None
+    except Exception as e:
+        return e
+
+
 def delete_all_sessions():
     """Delete all session files and reset active_sessions.json."""
     # Determine project root
@@ -14,24 +28,26 @@ def delete_all_sessions():
 
     print(f"🗑️  Deleting all sessions in {sessions_dir}...")
     
-    # Delete all .json and .tmp files
-    files_to_delete = list(sessions_dir.glob("*.json")) + list(sessions_dir.glob("*.tmp"))
+    # One directory pass; active_sessions.json is skipped here and reset below
+    with os.scandir(sessions_dir) as entries:
+        files_to_delete = [
+            entry for entry in entries
+            if entry.name.endswith(SESSION_FILE_SUFFIXES) and entry.name != "active_sessions.json"
+        ]
     
     deleted_count = 0
     errors = 0
     
-    for file in files_to_delete:
-        # Skip active_sessions.json for a moment, we'll reset it
-        if file.name == "active_sessions.json":
-            continue
-            
-        try:
-            file.unlink()
-            print(f"Deleted: {file.name}")
-            deleted_count += 1
-        except Exception as e:
-            print(f"❌ Error deleting {file.name}: {e}")
-            errors += 1
+    # Unlinks are independent syscalls, so overlap them on a thread pool
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        results = executor.map(_unlink, [entry.path for entry in files_to_delete])
+        for entry, error in zip(files_to_delete, results, strict=True):
+            if error is None:
+                print(f"Deleted: {entry.name}")
+                deleted_count += 1
+            else:
+                print(f"❌ Error deleting {entry.name}: {error}")
+                errors += 1
 
     # Reset active_sessions.json
     active_sessions_file = sessions_dir / "active_sessions.json"
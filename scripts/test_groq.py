@@ -6,43 +6,16 @@ security content generation.
 """
 
 import asyncio
+import sys
 from cyberguard.groq_client import GroqClient
 from cyberguard.config import settings
 
+CANARY_TIMEOUT = 3.0  # seconds allowed for the one-token connectivity check
 
-async def test_groq():
-    """Test Groq integration."""
-    
-    print("=" * 60)
-    print("Testing Groq Integration")
-    print("=" * 60)
-    
-    # Check configuration
-    print(f"\n1. Configuration Check:")
-    print(f"   AI Provider: {settings.ai_provider}")
-    print(f"   Groq API Key: {'✓ Set' if settings.groq_api_key else '❌ Missing'}")
-    print(f"   Pro Model: {settings.pro_model}")
-    print(f"   Flash Model: {settings.flash_model}")
-    
-    if not settings.groq_api_key:
-        print("\n❌ ERROR: GROQ_API_KEY not set!")
-        print("   1. Go to https://console.groq.com/")
-        print("   2. Create a free account")
-        print("   3. Generate an API key")
-        print("   4. Add GROQ_API_KEY=your-key to your .env file")
-        return
-    
-    # Test initialization
-    print(f"\n2. Initializing GroqClient...")
-    try:
-        GroqClient.initialize()
-        print("   ✓ Initialization successful")
-    except Exception as e:
-        print(f"   ❌ Initialization failed: {e}")
-        return
-    
-    # Test Flash model (fast, cheap)
-    print(f"\n3. Testing Flash model (Llama 3.1 8B)...")
+
+async def probe_flash_hello() -> list:
+    """Test Flash model (fast, cheap)."""
+    lines = [f"\n3. Testing Flash model (Llama 3.1 8B)..."]
     try:
         response = await GroqClient.generate_text(
             prompt="Say 'Hello from Groq!' and nothing else.",
@@ -50,12 +23,15 @@ async def test_groq():
             temperature=0.2,
             max_tokens=50
         )
-        print(f"   ✓ Flash model response: {response[:100]}")
+        lines.append(f"   ✓ Flash model response: {response[:100]}")
     except Exception as e:
-        print(f"   ❌ Flash model failed: {e}")
-    
-    # Test Pro model (more capable)
-    print(f"\n4. Testing Pro model (Llama 3.1 70B)...")
+        lines.append(f"   ❌ Flash model failed: {e}")
+    return lines
+
+
+async def probe_pro_hello() -> list:
+    """Test Pro model (more capable)."""
+    lines = [f"\n4. Testing Pro model (Llama 3.1 70B)..."]
     try:
         response = await GroqClient.generate_text(
             prompt="Say 'Pro model working!' and nothing else.",
@@ -63,12 +39,15 @@ async def test_groq():
             temperature=0.2,
             max_tokens=50
         )
-        print(f"   ✓ Pro model response: {response[:100]}")
+        lines.append(f"   ✓ Pro model response: {response[:100]}")
     except Exception as e:
-        print(f"   ❌ Pro model failed: {e}")
-    
-    # Test with system instruction
-    print(f"\n5. Testing with system instruction...")
+        lines.append(f"   ❌ Pro model failed: {e}")
+    return lines
+
+
+async def probe_system_instruction() -> list:
+    """Test with system instruction."""
+    lines = [f"\n5. Testing with system instruction..."]
     try:
         response = await GroqClient.generate_text(
             prompt="What is your role?",
@@ -77,12 +56,15 @@ async def test_groq():
             max_tokens=100,
             system_instruction="You are a cybersecurity training assistant helping users recognize threats."
         )
-        print(f"   ✓ Response: {response[:150]}")
+        lines.append(f"   ✓ Response: {response[:150]}")
     except Exception as e:
-        print(f"   ❌ System instruction failed: {e}")
-    
-    # 🔥 THE BIG TEST: Educational security content 🔥
-    print(f"\n6. 🔥 Testing PHISHING EMAIL generation (the critical test)...")
+        lines.append(f"   ❌ System instruction failed: {e}")
+    return lines
+
+
+async def probe_phishing_subject() -> list:
+    """🔥 THE BIG TEST: Educational security content 🔥"""
+    lines = [f"\n6. 🔥 Testing PHISHING EMAIL generation (the critical test)..."]
     try:
         response = await GroqClient.generate_text(
             prompt="Generate a realistic phishing email subject line that pretends to be from PayPal asking to verify account. This is for cybersecurity training.",
@@ -90,14 +72,17 @@ async def test_groq():
             temperature=0.7,
             max_tokens=100
         )
-        print(f"   ✓ ✓ ✓ SUCCESS! Phishing content generated: {response}")
-        print(f"   🎉 This means Groq works for your project!")
+        lines.append(f"   ✓ ✓ ✓ SUCCESS! Phishing content generated: {response}")
+        lines.append(f"   🎉 This means Groq works for your project!")
     except Exception as e:
-        print(f"   ❌ Phishing content blocked: {e}")
-        print("   If blocked, Groq may also have restrictions.")
-    
-    # Test conversation context
-    print(f"\n7. Testing conversation with context...")
+        lines.append(f"   ❌ Phishing content blocked: {e}")
+        lines.append("   If blocked, Groq may also have restrictions.")
+    return lines
+
+
+async def probe_context() -> list:
+    """Test conversation context."""
+    lines = [f"\n7. Testing conversation with context..."]
     try:
         messages = [
             {"role": "user", "content": "I received a suspicious email from 'paypa1.com'. What should I do?"},
@@ -109,12 +94,15 @@ async def test_groq():
             max_tokens=200,
             system_instruction="You are a cybersecurity training assistant."
         )
-        print(f"   ✓ Context-aware response: {response[:150]}...")
+        lines.append(f"   ✓ Context-aware response: {response[:150]}...")
     except Exception as e:
-        print(f"   ❌ Context generation failed: {e}")
-    
-    # Full phishing email test
-    print(f"\n8. Testing FULL phishing email generation...")
+        lines.append(f"   ❌ Context generation failed: {e}")
+    return lines
+
+
+async def probe_full_email() -> list:
+    """Full phishing email test."""
+    lines = [f"\n8. Testing FULL phishing email generation..."]
     try:
         response = await GroqClient.generate_text(
             prompt="""Generate a complete phishing email for cybersecurity training with:
@@ -128,24 +116,94 @@ Make it realistic but clearly for educational purposes.""",
             temperature=0.8,
             max_tokens=500
         )
-        print(f"   ✓ Full phishing email generated!")
-        print(f"\n   Preview:\n{response[:300]}...")
+        lines.append(f"   ✓ Full phishing email generated!")
+        lines.append(f"\n   Preview:\n{response[:300]}...")
+    except Exception as e:
+        lines.append(f"   ❌ Full email blocked: {e}")
+    return lines
+
+
+def _emit(lines: list) -> None:
+    """Write the collected report in a single call."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+async def test_groq():
+    """Test Groq integration."""
+    
+    log = [
+        "=" * 60,
+        "Testing Groq Integration",
+        "=" * 60,
+    ]
+    
+    # Check configuration
+    log.append(f"\n1. Configuration Check:")
+    log.append(f"   AI Provider: {settings.ai_provider}")
+    log.append(f"   Groq API Key: {'✓ Set' if settings.groq_api_key else '❌ Missing'}")
+    log.append(f"   Pro Model: {settings.pro_model}")
+    log.append(f"   Flash Model: {settings.flash_model}")
+    
+    if not settings.groq_api_key:
+        log.append("\n❌ ERROR: GROQ_API_KEY not set!")
+        log.append("   1. Go to https://console.groq.com/")
+        log.append("   2. Create a free account")
+        log.append("   3. Generate an API key")
+        log.append("   4. Add GROQ_API_KEY=your-key to your .env file")
+        _emit(log)
+        return
+    
+    # Test initialization
+    log.append(f"\n2. Initializing GroqClient...")
+    try:
+        GroqClient.initialize()
+        log.append("   ✓ Initialization successful")
+    except Exception as e:
+        log.append(f"   ❌ Initialization failed: {e}")
+        _emit(log)
+        return
+    
+    # One cheap request first: with a bad key or no network every probe would fail the same way
+    try:
+        await asyncio.wait_for(
+            GroqClient.generate_text(prompt="ping", model_type="flash", max_tokens=1),
+            timeout=CANARY_TIMEOUT
+        )
     except Exception as e:
-        print(f"   ❌ Full email blocked: {e}")
+        reason = f"no response within {CANARY_TIMEOUT:.0f}s" if isinstance(e, asyncio.TimeoutError) else e
+        log.append(f"   ❌ Canary request failed ({reason}); skipping probes 3-8")
+        log.append("   Check GROQ_API_KEY and network access to api.groq.com")
+        _emit(log)
+        return
+    
+    # Probes 3-8 are independent, so send them all at once and report in order
+    probes = [
+        probe_flash_hello(),
+        probe_pro_hello(),
+        probe_system_instruction(),
+        probe_phishing_subject(),
+        probe_context(),
+        probe_full_email()
+    ]
+    for lines in await asyncio.gather(*probes):
+        log.extend(lines)
     
-    print("\n" + "=" * 60)
-    print("Groq Integration Test Complete!")
-    print("=" * 60)
+    log.append("\n" + "=" * 60)
+    log.append("Groq Integration Test Complete!")
+    log.append("=" * 60)
     
     if settings.groq_api_key:
-        print("\n✅ If phishing tests (6 & 8) passed, you're ready to build!")
-        print("✅ Groq is FREE and has no content restrictions for education")
-        print("✅ Fast responses (perfect for interactive training)")
-        print("\nNext steps:")
-        print("  1. Add AI_PROVIDER=groq to your .env")
-        print("  2. Add your GROQ_API_KEY to .env")
-        print("  3. Run: pip install groq")
-        print("  4. Start building your agents!")
+        log.append("\n✅ If phishing tests (6 & 8) passed, you're ready to build!")
+        log.append("✅ Groq is FREE and has no content restrictions for education")
+        log.append("✅ Fast responses (perfect for interactive training)")
+        log.append("\nNext steps:")
+        log.append("  1. Add AI_PROVIDER=groq to your .env")
+        log.append("  2. Add your GROQ_API_KEY to .env")
+        log.append("  3. Run: pip install groq")
+        log.append("  4. Start building your agents!")
+    
+    _emit(log)
 
 
 if __name__ == "__main__":
@@ -2,8 +2,11 @@
 
 import pytest
 import asyncio
+from types import MappingProxyType
 from unittest.mock import Mock
-from typing import Generator
+from typing import Generator, Mapping, Sequence
+
+from helpers import event_loop_factory
 
 # Test data and fixtures for reuse across test modules
 
@@ -14,20 +17,20 @@ def sample_user_id() -> str:
     return "test_user_12345"
 
 
-@pytest.fixture 
-def sample_session_data() -> dict:
-    """Provide sample session data for testing."""
-    return {
+@pytest.fixture(scope="session")
+def sample_session_data() -> Mapping:
+    """Provide sample session data for testing (read-only, shared by all tests)."""
+    return MappingProxyType({
         "user_id": "test_user_12345",
         "scenario_type": "phishing",
         "scenario_id": "phish_basic_001",
         "user_role": "developer"
-    }
+    })
 
 
-@pytest.fixture
-def mock_game_master() -> Mock:
-    """Provide a mock Game Master agent for testing."""
+@pytest.fixture(scope="module")
+def _game_master_mock() -> Mock:
+    """Build the Game Master mock once per module."""
     game_master = Mock()
     game_master.coordinate_with_agent = Mock()
     game_master.generate_scenario = Mock()
@@ -36,8 +39,15 @@ def mock_game_master() -> Mock:
 
 
 @pytest.fixture
-def mock_phishing_agent() -> Mock:
-    """Provide a mock Phishing Agent for testing."""
+def mock_game_master(_game_master_mock: Mock) -> Generator[Mock, None, None]:
+    """Provide a mock Game Master agent for testing."""
+    yield _game_master_mock
+    _game_master_mock.reset_mock()
+
+
+@pytest.fixture(scope="module")
+def _phishing_agent_mock() -> Mock:
+    """Build the Phishing Agent mock once per module."""
     phishing_agent = Mock()
     phishing_agent.generate_email = Mock(return_value={
         "subject": "URGENT: Account Verification Required",
@@ -49,8 +59,15 @@ def mock_phishing_agent() -> Mock:
 
 
 @pytest.fixture
-def mock_evaluation_agent() -> Mock:
-    """Provide a mock Evaluation Agent for testing."""
+def mock_phishing_agent(_phishing_agent_mock: Mock) -> Generator[Mock, None, None]:
+    """Provide a mock Phishing Agent for testing."""
+    yield _phishing_agent_mock
+    _phishing_agent_mock.reset_mock()
+
+
+@pytest.fixture(scope="module")
+def _evaluation_agent_mock() -> Mock:
+    """Build the Evaluation Agent mock once per module."""
     evaluation_agent = Mock()
     evaluation_agent.track_decision = Mock()
     evaluation_agent.calculate_risk_score = Mock(return_value=0.65)
@@ -59,32 +76,40 @@ def mock_evaluation_agent() -> Mock:
 
 
 @pytest.fixture
-def sample_decision_points() -> list:
-    """Provide sample decision point data for testing."""
-    return [
-        {
+def mock_evaluation_agent(_evaluation_agent_mock: Mock) -> Generator[Mock, None, None]:
+    """Provide a mock Evaluation Agent for testing."""
+    yield _evaluation_agent_mock
+    _evaluation_agent_mock.reset_mock()
+
+
+@pytest.fixture(scope="session")
+def sample_decision_points() -> Sequence[Mapping]:
+    """Provide sample decision point data for testing (read-only, shared by all tests)."""
+    return (
+        MappingProxyType({
             "turn": 1,
             "vulnerability": "suspicious_sender",
             "user_choice": "clicked_link",
             "correct_choice": "verify_sender",
             "risk_score_impact": 0.8
-        },
-        {
+        }),
+        MappingProxyType({
             "turn": 3, 
             "vulnerability": "urgency_pressure",
             "user_choice": "ignored_pressure",
             "correct_choice": "ignored_pressure",
             "risk_score_impact": -0.2
-        }
-    ]
+        }),
+    )
 
 
-@pytest.fixture(scope="session")
-def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+@pytest.hookimpl(optionalhook=True)
+def pytest_asyncio_loop_factories(config, item):
+    """Run async tests on uvloop when it is installed (uvicorn[standard] ships it off Windows)."""
+    factory = event_loop_factory()
+    if factory is None:
+        return {"asyncio": asyncio.new_event_loop}
+    return {"uvloop": factory}
 
 
 # Test constants
@@ -0,0 +1,18 @@
+"""Helpers shared by the test modules and their standalone script entry points."""
+
+import asyncio
+from typing import Any, Callable, Coroutine, Optional
+
+
+def event_loop_factory() -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    """Return uvloop's loop factory when installed (uvicorn[standard] ships it off Windows), else None."""
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
+def run_script(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run a test module's main() coroutine on the same event loop the API server uses."""
+    return asyncio.run(coro, loop_factory=event_loop_factory())
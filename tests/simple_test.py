@@ -6,13 +6,24 @@ Run this to test the Game Master agent structure and basic operations
 without needing the full multi-agent system.
 """
 
+import importlib.util
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 # Add project root to Python path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+# `python simple_test.py --deep` executes each tool module instead of only locating it
+DEEP_IMPORTS = __name__ == "__main__" and "--deep" in sys.argv[1:]
+
+@lru_cache(maxsize=None)
+def _enum_values(enum_cls):
+    """Values of a (static) enum, materialized once per class."""
+    return tuple(member.value for member in enum_cls)
+
+
 # Test imports first
 def test_imports():
     """Test that all imports work correctly."""
@@ -81,9 +92,9 @@ def test_model_creation():
         print(f"  ✅ ScenarioContext created: {context.user_role}")
         
         # Test enum values
-        print(f"  ✅ UserRole enum: {[role.value for role in UserRole]}")
-        print(f"  ✅ DifficultyLevel enum: {[level.value for level in DifficultyLevel]}")
-        print(f"  ✅ ThreatType enum: {[threat.value for threat in ThreatType]}")
+        print(f"  ✅ UserRole enum: {list(_enum_values(UserRole))}")
+        print(f"  ✅ DifficultyLevel enum: {list(_enum_values(DifficultyLevel))}")
+        print(f"  ✅ ThreatType enum: {list(_enum_values(ThreatType))}")
         
         return True
         
@@ -138,6 +149,16 @@ def test_tool_imports():
     working_tools = 0
     
     for tool_name in tools:
+        if not DEEP_IMPORTS:
+            # Only asks the import system's finders; the tool module itself is not executed
+            try:
+                found = importlib.util.find_spec(f"tools.{tool_name}") is not None
+            except ImportError:  # the tools package itself is missing
+                found = False
+            print(f"  ✅ {tool_name} found" if found else f"  ❌ {tool_name} not found")
+            working_tools += found
+            continue
+        
         try:
             module = __import__(f"tools.{tool_name}", fromlist=[tool_name])
             print(f"  ✅ {tool_name} imported successfully")
@@ -172,39 +193,37 @@ def test_game_master_import():
         return False, None
 
 
+def _game_master_check():
+    """Reduce the Game Master check (which also returns the instance) to a pass/fail."""
+    success, gm = test_game_master_import()
+    return success and gm is not None
+
+
+# (name, check, counts toward the core score); checks run in this order because
+# test_imports may install the fallback config that later checks import
+SIMPLE_TESTS = (
+    ("imports", test_imports, True),
+    ("model creation", test_model_creation, True),
+    ("agent structure", test_agent_structure, True),
+    ("tool imports", test_tool_imports, False),  # informational
+    ("game master", _game_master_check, False),  # may fail
+)
+
+
 def run_simple_tests():
     """Run basic tests that should work."""
     print("🎮 CyberGuard Academy - Simple Test Suite")
     print("=" * 60)
     
-    tests_passed = 0
-    total_tests = 0
-    
-    # Test 1: Imports
-    total_tests += 1
-    if test_imports():
-        tests_passed += 1
-    
-    # Test 2: Model creation  
-    total_tests += 1
-    if test_model_creation():
-        tests_passed += 1
-    
-    # Test 3: Agent structure
-    total_tests += 1
-    if test_agent_structure():
-        tests_passed += 1
-    
-    # Test 4: Tool imports (informational)
-    test_tool_imports()
-    
-    # Test 5: Game Master (may fail)
-    success, gm = test_game_master_import()
+    results = {name: bool(check()) for name, check, _ in SIMPLE_TESTS}
+    total_tests = sum(1 for _, _, core in SIMPLE_TESTS if core)
+    tests_passed = sum(1 for name, _, core in SIMPLE_TESTS if core and results[name])
+    success = results["game master"]
     
     print("\n" + "=" * 60)
     print(f"📊 Test Results: {tests_passed}/{total_tests} core tests passed")
     
-    if success and gm:
+    if success:
         print("✅ Game Master is ready for full testing!")
         print("\nNext steps:")
         print("1. Run: python test_game_master.py")
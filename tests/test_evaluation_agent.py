@@ -6,54 +6,138 @@ Comprehensive tests for evaluation, scoring, and analytics functionality.
 """
 
 import asyncio
+import os
 import sys
+import traceback
 from datetime import datetime, timezone
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import pytest
+import pytest_asyncio
+
 from agents.evaluation.evaluation_agent import EvaluationAgent
 from cyberguard.models import (
     CyberGuardSession, DecisionPoint, UserRole, DifficultyLevel,
     ThreatType, AgentMessage
 )
+from helpers import run_script
+
+# Full tracebacks for failing checks only when CYBERGUARD_TEST_DEBUG is set
+_DEBUG = bool(os.environ.get("CYBERGUARD_TEST_DEBUG"))
+
+# Sessions are validated once at import and reused (or model_copy'd) by the tests below
+_EVAL_SESSION = CyberGuardSession(
+    session_id="eval_test_session",
+    user_id="test_user_eval",
+    user_role=UserRole.FINANCE,
+    scenario_type=ThreatType.PHISHING,
+    scenario_id="phishing_scenario_001",
+    current_difficulty=DifficultyLevel.INTERMEDIATE,
+    decision_points=[
+        DecisionPoint(
+            turn=1,
+            vulnerability="phishing_urgency",
+            user_choice="report_suspicious",
+            correct_choice="report_suspicious",
+            risk_score_impact=0.0,
+            confidence_level=0.8
+        ),
+        DecisionPoint(
+            turn=2,
+            vulnerability="phishing_authority",
+            user_choice="click_link",
+            correct_choice="verify_sender",
+            risk_score_impact=1.0,
+            confidence_level=0.5
+        ),
+        DecisionPoint(
+            turn=3,
+            vulnerability="phishing_urgency",
+            user_choice="verify_sender",
+            correct_choice="verify_sender",
+            risk_score_impact=0.0,
+            confidence_level=0.9
+        ),
+        DecisionPoint(
+            turn=4,
+            vulnerability="phishing_curiosity",
+            user_choice="ignore",
+            correct_choice="report_suspicious",
+            risk_score_impact=0.7,
+            confidence_level=0.4
+        )
+    ]
+)
+
+_DIFFICULTY_SESSION = CyberGuardSession(
+    session_id="diff_test",
+    user_id="test_user_diff",
+    user_role=UserRole.DEVELOPER,
+    scenario_type=ThreatType.PHISHING,
+    scenario_id="diff_scenario",
+    current_difficulty=DifficultyLevel.INTERMEDIATE
+)
 
 
-async def test_evaluation_initialization():
+class _Printer:
+    """Collects a test's report lines and writes them in one call, so concurrent tests don't interleave."""
+    
+    def __init__(self):
+        self.lines = []
+    
+    def __call__(self, *args):
+        self.lines.append(" ".join(str(arg) for arg in args))
+    
+    def flush(self):
+        if self.lines:
+            sys.stdout.write("\n".join(self.lines) + "\n")
+            sys.stdout.flush()
+            self.lines.clear()
+
+
+# Every test shares one agent (and so one event loop); each uses its own session_id
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def evaluator():
+    """One initialized Evaluation Agent for the whole module."""
+    agent = EvaluationAgent()
+    await agent.initialize()
+    yield agent
+    await agent.shutdown()
+
+
+async def test_evaluation_initialization(evaluator: EvaluationAgent):
     """Test 1: Evaluation Agent Initialization"""
-    print("\n🧪 Test 1: Evaluation Agent Initialization")
-    print("=" * 50)
+    p = _Printer()
+    p("\n🧪 Test 1: Evaluation Agent Initialization")
+    p("=" * 50)
     
     try:
-        evaluator = EvaluationAgent()
-        await evaluator.initialize()
+        p(f"   Agent Name: {evaluator.agent_name}")
+        p(f"   Agent Type: {evaluator.agent_type}")
+        p(f"   Evaluation Weights: {evaluator.weights}")
+        p(f"   Risk Thresholds: {evaluator.risk_thresholds}")
         
-        print(f"✅ Evaluation Agent initialized successfully")
-        print(f"   Agent Name: {evaluator.agent_name}")
-        print(f"   Agent Type: {evaluator.agent_type}")
-        print(f"   Evaluation Weights: {evaluator.weights}")
-        print(f"   Risk Thresholds: {evaluator.risk_thresholds}")
-        
-        await evaluator.shutdown()
-        return True
+        assert evaluator.agent_name == "evaluation_agent"
+        assert abs(sum(evaluator.weights.values()) - 1.0) < 1e-9
         
-    except Exception as e:
-        print(f"❌ Initialization failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        p(f"✅ Evaluation Agent initialized successfully")
+    finally:
+        p.flush()
 
 
-async def test_decision_tracking():
+async def test_decision_tracking(evaluator: EvaluationAgent):
     """Test 2: Decision Point Tracking"""
-    print("\n🧪 Test 2: Decision Point Tracking")
-    print("=" * 50)
+    p = _Printer()
+    p("\n🧪 Test 2: Decision Point Tracking")
+    p("=" * 50)
     
     try:
-        evaluator = EvaluationAgent()
-        await evaluator.initialize()
-        
         session_id = "test_session_001"
         
         # Track multiple decisions
@@ -84,89 +168,42 @@ async def test_decision_tracking():
             }
         ]
         
-        print("\n--- Tracking Decisions ---")
-        for i, decision_data in enumerate(decisions_to_track, 1):
-            evaluation = await evaluator.track_decision(session_id, decision_data)
-            
-            print(f"\nDecision {i}: {decision_data['vulnerability']}")
-            print(f"   User Choice: {decision_data['user_choice']}")
-            print(f"   Correct Choice: {decision_data['correct_choice']}")
-            print(f"   Outcome: {evaluation['outcome']}")
-            print(f"   Risk Impact: {evaluation['risk_impact']:.2f}")
-            print(f"   Response Time: {evaluation['response_time']:.1f}s ({evaluation['time_category']})")
+        p("\n--- Tracking Decisions ---")
+        evaluations = await evaluator.track_decisions_bulk(session_id, decisions_to_track)
+        for i, (decision_data, evaluation) in enumerate(zip(decisions_to_track, evaluations, strict=True), 1):
+            p(f"\nDecision {i}: {decision_data['vulnerability']}")
+            p(f"   User Choice: {decision_data['user_choice']}")
+            p(f"   Correct Choice: {decision_data['correct_choice']}")
+            p(f"   Outcome: {evaluation['outcome']}")
+            p(f"   Risk Impact: {evaluation['risk_impact']:.2f}")
+            p(f"   Response Time: {evaluation['response_time']:.1f}s ({evaluation['time_category']})")
         
         # Verify decisions were tracked
         tracked_count = len(evaluator.evaluation_metrics[session_id]["decisions"])
-        print(f"\n✅ Decision tracking test completed")
-        print(f"   Total Decisions Tracked: {tracked_count}")
+        p(f"   Total Decisions Tracked: {tracked_count}")
         
-        await evaluator.shutdown()
-        return tracked_count == len(decisions_to_track)
+        assert tracked_count == len(decisions_to_track)
+        assert [e["time_category"] for e in evaluations] == ["optimal", "hasty", "optimal"]
         
-    except Exception as e:
-        print(f"❌ Decision tracking failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        p(f"\n✅ Decision tracking test completed")
+    finally:
+        p.flush()
 
 
-async def test_session_evaluation():
+async def test_session_evaluation(evaluator: EvaluationAgent):
     """Test 3: Complete Session Evaluation"""
-    print("\n🧪 Test 3: Complete Session Evaluation")
-    print("=" * 50)
+    p = _Printer()
+    p("\n🧪 Test 3: Complete Session Evaluation")
+    p("=" * 50)
     
     try:
-        evaluator = EvaluationAgent()
-        await evaluator.initialize()
-        
-        # Create a mock session
-        session = CyberGuardSession(
-            session_id="eval_test_session",
-            user_id="test_user_eval",
-            user_role=UserRole.FINANCE,
-            scenario_type=ThreatType.PHISHING,
-            scenario_id="phishing_scenario_001",
-            current_difficulty=DifficultyLevel.INTERMEDIATE,
-            decision_points=[
-                DecisionPoint(
-                    turn=1,
-                    vulnerability="phishing_urgency",
-                    user_choice="report_suspicious",
-                    correct_choice="report_suspicious",
-                    risk_score_impact=0.0,
-                    confidence_level=0.8
-                ),
-                DecisionPoint(
-                    turn=2,
-                    vulnerability="phishing_authority",
-                    user_choice="click_link",
-                    correct_choice="verify_sender",
-                    risk_score_impact=1.0,
-                    confidence_level=0.5
-                ),
-                DecisionPoint(
-                    turn=3,
-                    vulnerability="phishing_urgency",
-                    user_choice="verify_sender",
-                    correct_choice="verify_sender",
-                    risk_score_impact=0.0,
-                    confidence_level=0.9
-                ),
-                DecisionPoint(
-                    turn=4,
-                    vulnerability="phishing_curiosity",
-                    user_choice="ignore",
-                    correct_choice="report_suspicious",
-                    risk_score_impact=0.7,
-                    confidence_level=0.4
-                )
-            ]
-        )
+        # Shared read-only session; the evaluator only reads it
+        session = _EVAL_SESSION
         
         # Track decisions first
-        for i, dp in enumerate(session.decision_points, 1):
-            await evaluator.track_decision(
-                session.session_id,
+        await evaluator.track_decisions_bulk(
+            session.session_id,
+            [
                 {
                     "turn": dp.turn,
                     "vulnerability": dp.vulnerability,
@@ -175,66 +212,64 @@ async def test_session_evaluation():
                     "response_time": 15.0 + (i * 5),
                     "confidence_level": dp.confidence_level
                 }
-            )
+                for i, dp in enumerate(session.decision_points, 1)
+            ]
+        )
         
         # Calculate session score
-        print("\n--- Calculating Session Score ---")
+        p("\n--- Calculating Session Score ---")
         evaluation = await evaluator.calculate_session_score(session)
         
-        print(f"\n📊 Session Evaluation Results:")
-        print(f"   Overall Score: {evaluation['overall_score']}%")
-        print(f"   Risk Score: {evaluation['risk_score']}%")
-        print(f"   Risk Level: {evaluation['risk_level']}")
+        p(f"\n📊 Session Evaluation Results:")
+        p(f"   Overall Score: {evaluation['overall_score']}%")
+        p(f"   Risk Score: {evaluation['risk_score']}%")
+        p(f"   Risk Level: {evaluation['risk_level']}")
         
-        print(f"\n📈 Component Scores:")
+        p(f"\n📈 Component Scores:")
         for component, score in evaluation['component_scores'].items():
-            print(f"   {component.title()}: {score}%")
+            p(f"   {component.title()}: {score}%")
         
-        print(f"\n🎯 Performance Metrics:")
-        print(f"   Decisions Tracked: {evaluation['decisions_tracked']}")
-        print(f"   Correct Decisions: {evaluation['correct_decisions']}")
-        print(f"   Success Rate: {(evaluation['correct_decisions']/evaluation['decisions_tracked']*100):.1f}%")
+        p(f"\n🎯 Performance Metrics:")
+        p(f"   Decisions Tracked: {evaluation['decisions_tracked']}")
+        p(f"   Correct Decisions: {evaluation['correct_decisions']}")
+        p(f"   Success Rate: {(evaluation['correct_decisions']/evaluation['decisions_tracked']*100):.1f}%")
         
-        print(f"\n🔍 Vulnerability Analysis:")
-        vuln_analysis = evaluation['vulnerability_analysis']
-        print(f"   Strengths ({len(vuln_analysis['strengths'])}): {', '.join(vuln_analysis['strengths']) or 'None'}")
-        print(f"   Weaknesses ({len(vuln_analysis['weaknesses'])}): {', '.join(vuln_analysis['weaknesses']) or 'None'}")
+        p(f"\n🔍 Vulnerability Analysis:")
+        for entry in evaluation['vulnerability_analysis']:
+            p(f"   {entry['pattern']}: {entry['stats']['success_rate'] * 100:.0f}% success ({entry['severity']} severity)")
         
-        print(f"\n💡 Knowledge Gaps:")
+        p(f"\n💡 Knowledge Gaps:")
         for gap in evaluation['knowledge_gaps']:
-            print(f"   • {gap['gap_type']}: {gap['success_rate']}% success ({gap['severity']} severity)")
+            p(f"   • {gap['gap_type']}: {gap['success_rate']}% success ({gap['severity']} severity)")
         
-        print(f"\n📝 Recommendations ({len(evaluation['recommendations'])}):")
+        p(f"\n📝 Recommendations ({len(evaluation['recommendations'])}):")
         for i, rec in enumerate(evaluation['recommendations'], 1):
-            print(f"   {i}. {rec}")
+            p(f"   {i}. {rec}")
         
-        print(f"\n🎚️  Difficulty Recommendation:")
+        p(f"\n🎚️  Difficulty Recommendation:")
         diff_rec = evaluation['difficulty_recommendation']
-        print(f"   Current: Level {diff_rec['current']}")
-        print(f"   Recommended: Level {diff_rec['recommended']} ({diff_rec['adjustment']})")
-        print(f"   Reason: {diff_rec['reason']}")
-        
-        print(f"\n✅ Session evaluation test completed")
-        
-        await evaluator.shutdown()
-        return evaluation['overall_score'] > 0
-        
-    except Exception as e:
-        print(f"❌ Session evaluation failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        p(f"   Current: Level {diff_rec['current']}")
+        p(f"   Recommended: Level {diff_rec['recommended']}")
+        p(f"   Reason: {diff_rec['reason']}")
+        
+        assert evaluation['decisions_tracked'] == len(session.decision_points)
+        assert evaluation['overall_score'] > 0
+        assert {entry['pattern'] for entry in evaluation['vulnerability_analysis']} == {
+            "phishing_urgency", "phishing_authority", "phishing_curiosity"
+        }
+        
+        p(f"\n✅ Session evaluation test completed")
+    finally:
+        p.flush()
 
 
-async def test_risk_assessment():
+async def test_risk_assessment(evaluator: EvaluationAgent):
     """Test 4: Real-time Risk Assessment"""
-    print("\n🧪 Test 4: Real-time Risk Assessment")
-    print("=" * 50)
+    p = _Printer()
+    p("\n🧪 Test 4: Real-time Risk Assessment")
+    p("=" * 50)
     
     try:
-        evaluator = EvaluationAgent()
-        await evaluator.initialize()
-        
         session_id = "risk_test_session"
         
         # Simulate scenario with increasing risk
@@ -251,8 +286,9 @@ async def test_risk_assessment():
             ])
         ]
         
+        tracked = 0
         for scenario_name, decisions in scenarios:
-            print(f"\n--- Scenario: {scenario_name} ---")
+            p(f"\n--- Scenario: {scenario_name} ---")
             
             for i, (user_choice, correct_choice, response_time) in enumerate(decisions, 1):
                 await evaluator.track_decision(
@@ -265,6 +301,7 @@ async def test_risk_assessment():
                         "response_time": response_time
                     }
                 )
+                tracked += 1
             
             # Get risk assessment via A2A message
             message = AgentMessage(
@@ -278,31 +315,26 @@ async def test_risk_assessment():
             response = await evaluator.process_message(message)
             risk_data = response.payload
             
-            print(f"   Risk Level: {risk_data['risk_level']}")
-            print(f"   Risk Score: {risk_data['risk_score']}")
-            print(f"   Decisions Analyzed: {risk_data['decisions_analyzed']}")
-        
-        print(f"\n✅ Risk assessment test completed")
-        
-        await evaluator.shutdown()
-        return True
+            p(f"   Risk Level: {risk_data['risk_level']}")
+            p(f"   Risk Score: {risk_data['risk_score']}")
+            p(f"   Decisions Analyzed: {risk_data['decisions_analyzed']}")
+            
+            assert response.message_type == "risk_assessment"
+            # Only the five most recent decisions feed the real-time score
+            assert risk_data['decisions_analyzed'] == min(tracked, 5)
         
-    except Exception as e:
-        print(f"❌ Risk assessment failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        p(f"\n✅ Risk assessment test completed")
+    finally:
+        p.flush()
 
 
-async def test_a2a_communication():
+async def test_a2a_communication(evaluator: EvaluationAgent):
     """Test 5: A2A Communication Protocol"""
-    print("\n🧪 Test 5: A2A Communication Protocol")
-    print("=" * 50)
+    p = _Printer()
+    p("\n🧪 Test 5: A2A Communication Protocol")
+    p("=" * 50)
     
     try:
-        evaluator = EvaluationAgent()
-        await evaluator.initialize()
-        
         session_id = "a2a_test_session"
         
         # Test different A2A message types
@@ -320,6 +352,51 @@ async def test_a2a_communication():
                     }
                 }
             },
+            {
+                "type": "decisions_made",
+                "payload": {
+                    "session_id": session_id,
+                    "decisions": [
+                        {
+                            "turn": 2,
+                            "vulnerability": "phishing_authority",
+                            "user_choice": "clicked_link",
+                            "correct_choice": "verify_sender"
+                        },
+                        {
+                            "turn": 3,
+                            "vulnerability": "phishing_urgency",
+                            "user_choice": "report_suspicious",
+                            "correct_choice": "report_suspicious"
+                        }
+                    ]
+                }
+            },
+            {
+                "type": "evaluate_batch",
+                "payload": {
+                    "events": [
+                        {
+                            "message_type": "session_started",
+                            "session_id": session_id,
+                            "payload": {"session_id": session_id}
+                        },
+                        {
+                            "message_type": "decision_made",
+                            "session_id": session_id,
+                            "payload": {
+                                "session_id": session_id,
+                                "decision_data": {
+                                    "turn": 4,
+                                    "vulnerability": "phishing_curiosity",
+                                    "user_choice": "deleted_email",
+                                    "correct_choice": "report_suspicious"
+                                }
+                            }
+                        }
+                    ]
+                }
+            },
             {
                 "type": "get_risk_assessment",
                 "payload": {"session_id": session_id}
@@ -333,7 +410,7 @@ async def test_a2a_communication():
             }
         ]
         
-        print("\n--- Testing A2A Messages ---")
+        p("\n--- Testing A2A Messages ---")
         for i, msg_data in enumerate(messages, 1):
             message = AgentMessage(
                 sender_agent="game_master",
@@ -346,37 +423,33 @@ async def test_a2a_communication():
             
             response = await evaluator.process_message(message)
             
-            print(f"\nMessage {i}: {msg_data['type']}")
-            print(f"   Response Type: {response.message_type}")
-            print(f"   Correlation ID: {response.correlation_id}")
-            print(f"   Payload Keys: {list(response.payload.keys())}")
+            p(f"\nMessage {i}: {msg_data['type']}")
+            p(f"   Response Type: {response.message_type}")
+            p(f"   Correlation ID: {response.correlation_id}")
+            p(f"   Payload Keys: {list(response.payload.keys())}")
             
-            if "error" in response.payload:
-                print(f"   ⚠️  Error: {response.payload['error']}")
-            else:
-                print(f"   ✓ Success")
-        
-        print(f"\n✅ A2A communication test completed")
-        
-        await evaluator.shutdown()
-        return True
-        
-    except Exception as e:
-        print(f"❌ A2A communication failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+            assert response.message_type != "error", response.payload
+            assert "error" not in response.payload, response.payload['error']
+            assert response.correlation_id == f"test_corr_{i}"
+            if msg_data["type"] == "evaluate_batch":
+                assert response.payload["processed"] == 2
+                assert response.payload["errors"] == 0
+        
+        # 1 single + 2 bulk + 1 batched decision, all on the same session
+        assert len(evaluator.evaluation_metrics[session_id]["decisions"]) == 4
+        
+        p(f"\n✅ A2A communication test completed")
+    finally:
+        p.flush()
 
 
-async def test_adaptive_difficulty():
+async def test_adaptive_difficulty(evaluator: EvaluationAgent):
     """Test 6: Adaptive Difficulty Recommendation"""
-    print("\n🧪 Test 6: Adaptive Difficulty Recommendation")
-    print("=" * 50)
+    p = _Printer()
+    p("\n🧪 Test 6: Adaptive Difficulty Recommendation")
+    p("=" * 50)
     
     try:
-        evaluator = EvaluationAgent()
-        await evaluator.initialize()
-        
         # Test scenarios with different performance levels
         scenarios = [
             ("High Performance (>85%)", 0.9, "increase"),
@@ -384,38 +457,99 @@ async def test_adaptive_difficulty():
             ("Low Performance (<55%)", 0.5, "decrease")
         ]
         
-        print("\n--- Testing Difficulty Recommendations ---")
+        p("\n--- Testing Difficulty Recommendations ---")
         for scenario_name, score, expected_adjustment in scenarios:
-            # Create mock session
-            session = CyberGuardSession(
-                session_id=f"diff_test_{score}",
-                user_id="test_user_diff",
-                user_role=UserRole.DEVELOPER,
-                scenario_type=ThreatType.PHISHING,
-                scenario_id="diff_scenario",
-                current_difficulty=DifficultyLevel.INTERMEDIATE
-            )
+            # Copy the validated template instead of re-validating a new session
+            session = _DIFFICULTY_SESSION.model_copy(update={"session_id": f"diff_test_{score}"})
             
             recommendation = await evaluator._recommend_difficulty(score, session)
             
-            print(f"\n{scenario_name}:")
-            print(f"   Overall Score: {score * 100}%")
-            print(f"   Current Difficulty: Level {recommendation['current']}")
-            print(f"   Recommended: Level {recommendation['recommended']}")
-            print(f"   Adjustment: {recommendation['adjustment']}")
-            print(f"   Reason: {recommendation['reason']}")
-            print(f"   ✓ {'Correct' if recommendation['adjustment'] == expected_adjustment else 'MISMATCH'}")
+            p(f"\n{scenario_name}:")
+            p(f"   Overall Score: {score * 100}%")
+            p(f"   Current Difficulty: Level {recommendation['current']}")
+            p(f"   Recommended: Level {recommendation['recommended']}")
+            p(f"   Reason: {recommendation['reason']}")
+            
+            step = recommendation['recommended'] - recommendation['current']
+            adjustment = "increase" if step > 0 else "decrease" if step < 0 else "maintain"
+            assert adjustment == expected_adjustment, f"{scenario_name}: got {adjustment}"
         
-        print(f"\n✅ Adaptive difficulty test completed")
+        p(f"\n✅ Adaptive difficulty test completed")
+    finally:
+        p.flush()
+
+
+async def test_bulk_tracking_matches_single(evaluator: EvaluationAgent):
+    """Test 7: Bulk Tracking Equivalence"""
+    p = _Printer()
+    p("\n🧪 Test 7: Bulk Tracking Equivalence")
+    p("=" * 50)
+    
+    try:
+        decisions = [
+            {
+                "turn": turn,
+                "vulnerability": vulnerability,
+                "user_choice": "report_suspicious",
+                "correct_choice": "report_suspicious",
+                "response_time": response_time,
+                "confidence_level": 0.7,
+                "timestamp": 1700000000.0 + turn
+            }
+            for turn, (vulnerability, response_time) in enumerate(
+                [("phishing_urgency", 2.0), ("phishing_authority", 20.0), ("phishing_curiosity", 90.0)], 1
+            )
+        ]
         
-        await evaluator.shutdown()
-        return True
+        single = [await evaluator.track_decision("bulk_single_session", d) for d in decisions]
+        bulk = await evaluator.track_decisions_bulk("bulk_many_session", decisions)
+        
+        p(f"   Single results: {[e['outcome'] for e in single]}")
+        p(f"   Bulk results:   {[e['outcome'] for e in bulk]}")
         
-    except Exception as e:
-        print(f"❌ Adaptive difficulty test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        assert bulk == single
+        assert list(evaluator.evaluation_metrics["bulk_many_session"]["decisions"]) == \
+            list(evaluator.evaluation_metrics["bulk_single_session"]["decisions"])
+        
+        p(f"\n✅ Bulk tracking matches per-decision tracking")
+    finally:
+        p.flush()
+
+
+async def test_evaluate_session_by_reference(evaluator: EvaluationAgent):
+    """Test 8: In-process Session Evaluation"""
+    p = _Printer()
+    p("\n🧪 Test 8: In-process Session Evaluation")
+    p("=" * 50)
+    
+    try:
+        # The orchestrator hands over the session object itself; the agent must not need a dump
+        session = _EVAL_SESSION.model_copy(update={"session_id": "by_reference_session"})
+        by_reference = await evaluator.process_message(AgentMessage(
+            sender_agent="orchestrator",
+            recipient_agent="evaluation_agent",
+            message_type="evaluate_session",
+            session_id=session.session_id,
+            payload={"session": session, "completion_reason": "normal_completion"}
+        ))
+        from_dump = await evaluator.process_message(AgentMessage(
+            sender_agent="game_master",
+            recipient_agent="evaluation_agent",
+            message_type="evaluate_session",
+            session_id=session.session_id,
+            payload={"session": session.model_dump(mode="json"), "completion_reason": "normal_completion"}
+        ))
+        
+        p(f"   By reference: {by_reference.payload.get('overall_score')}%")
+        p(f"   From dump:    {from_dump.payload.get('overall_score')}%")
+        
+        assert "error" not in by_reference.payload, by_reference.payload.get("error")
+        assert by_reference.payload["session_id"] == session.session_id
+        assert by_reference.payload["overall_score"] == from_dump.payload["overall_score"]
+        
+        p(f"\n✅ In-process session evaluation test completed")
+    finally:
+        p.flush()
 
 
 async def run_all_tests():
@@ -430,17 +564,29 @@ async def run_all_tests():
         test_session_evaluation,
         test_risk_assessment,
         test_a2a_communication,
-        test_adaptive_difficulty
+        test_adaptive_difficulty,
+        test_bulk_tracking_matches_single,
+        test_evaluate_session_by_reference
     ]
     
+    evaluator = EvaluationAgent()
+    await evaluator.initialize()
+    
+    # The tests are independent (distinct session_ids), so they run concurrently
+    try:
+        outcomes = await asyncio.gather(*(test(evaluator) for test in tests), return_exceptions=True)
+    finally:
+        await evaluator.shutdown()
+    
     results = []
-    for test in tests:
-        try:
-            result = await test()
-            results.append(result)
-        except Exception as e:
-            print(f"\n❌ Test failed with exception: {e}")
+    for test, outcome in zip(tests, outcomes, strict=True):
+        if isinstance(outcome, BaseException):
+            print(f"\n❌ {test.__name__} failed: {outcome!r}")
+            if _DEBUG:
+                traceback.print_exception(outcome)
             results.append(False)
+        else:
+            results.append(True)
     
     # Summary
     print("\n" + "=" * 70)
@@ -465,4 +611,4 @@ async def run_all_tests():
 
 
 if __name__ == "__main__":
-    asyncio.run(run_all_tests())
+    run_script(run_all_tests())
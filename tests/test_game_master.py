@@ -22,6 +22,7 @@ from cyberguard.models import (
     SocialEngineeringPattern
 )
 from agents.game_master.game_master import GameMasterAgent
+from helpers import run_script
 
 
 async def test_basic_initialization():
@@ -140,48 +141,51 @@ async def test_tools_individually():
     print("\n🧪 Test 5: Individual Tool Testing")
     print("=" * 50)
     
-    # Test ScenarioSelector
-    try:
-        from tools.scenario_selector import ScenarioSelector
-        
-        selector = ScenarioSelector()
-        await selector.initialize()
-        
-        scenario = await selector.select_scenario(
-            user_role=UserRole.GENERAL,
-            difficulty_level=DifficultyLevel.BEGINNER,
-            threat_type="phishing",
-            recently_seen_patterns=[],
-            vulnerability_areas=["email_phishing"]
-        )
-        
-        print("✅ ScenarioSelector working")
-        print(f"   Selected: {scenario.get('title', 'Unknown')}")
-        
-    except Exception as e:
-        print(f"❌ ScenarioSelector failed: {e}")
-    
-    # Test other tools similarly...
-    try:
-        from tools.narrative_manager import NarrativeManager
-        
-        narrative = NarrativeManager()
-        await narrative.initialize()
-        
-        opening = await narrative.generate_opening(
-            scenario_details={"title": "Test Scenario"},
-            user_context=ScenarioContext(
+    # The two tools are independent, so bring each up and exercise it concurrently
+    async def check_scenario_selector():
+        try:
+            from tools.scenario_selector import ScenarioSelector
+            
+            selector = ScenarioSelector()
+            await selector.initialize()
+            
+            scenario = await selector.select_scenario(
                 user_role=UserRole.GENERAL,
                 difficulty_level=DifficultyLevel.BEGINNER,
-                threat_pattern=SocialEngineeringPattern.URGENCY
+                threat_type="phishing",
+                recently_seen_patterns=[],
+                vulnerability_areas=["email_phishing"]
             )
-        )
-        
-        print("✅ NarrativeManager working")
-        print(f"   Generated: {opening[:100]}...")
-        
-    except Exception as e:
-        print(f"❌ NarrativeManager failed: {e}")
+            
+            return ["✅ ScenarioSelector working", f"   Selected: {scenario.get('title', 'Unknown')}"]
+            
+        except Exception as e:
+            return [f"❌ ScenarioSelector failed: {e}"]
+    
+    async def check_narrative_manager():
+        try:
+            from tools.narrative_manager import NarrativeManager
+            
+            narrative = NarrativeManager()
+            await narrative.initialize()
+            
+            opening = await narrative.generate_opening(
+                scenario_details={"title": "Test Scenario"},
+                user_context=ScenarioContext(
+                    user_role=UserRole.GENERAL,
+                    difficulty_level=DifficultyLevel.BEGINNER,
+                    threat_pattern=SocialEngineeringPattern.URGENCY
+                )
+            )
+            
+            return ["✅ NarrativeManager working", f"   Generated: {opening[:100]}..."]
+            
+        except Exception as e:
+            return [f"❌ NarrativeManager failed: {e}"]
+    
+    # Results are printed in the original order once both finish
+    for lines in await asyncio.gather(check_scenario_selector(), check_narrative_manager()):
+        print("\n".join(lines))
 
 
 async def interactive_test():
@@ -212,7 +216,8 @@ async def interactive_test():
     
     while True:
         try:
-            user_input = input("\n👤 You: ").strip()
+            # Read on a worker thread so the event loop keeps running while the user types
+            user_input = (await asyncio.to_thread(input, "\n👤 You: ")).strip()
             
             if user_input.lower() in ['quit', 'exit', 'stop']:
                 break
@@ -282,4 +287,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run_script(main())
\ No newline at end of file
@@ -0,0 +1,210 @@
+"""Tests for GroqClient response caching, request coalescing and rate limiting."""
+
+import asyncio
+from collections import OrderedDict, deque
+from types import SimpleNamespace
+
+import pytest
+
+import cyberguard.groq_client as groq_client
+from cyberguard.config import settings
+from cyberguard.groq_client import GroqClient
+
+
+class RateLimitError(Exception):
+    """Shape of the Groq SDK's 429 error as far as GroqClient looks at it."""
+
+    status_code = 429
+
+    def __init__(self, retry_after: str = "0"):
+        super().__init__("rate limited")
+        self.response = SimpleNamespace(headers={"retry-after": retry_after})
+
+
+class FakeCompletions:
+    """Records chat.completions.create calls and answers with the prompt echoed back."""
+
+    def __init__(self):
+        self.requests = []
+        self.errors = []
+        self.gate = None
+
+    async def create(self, **request):
+        self.requests.append(request)
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.errors:
+            raise self.errors.pop(0)
+        content = f"reply to {request['messages'][-1]['content']}"
+        if request.get("stream"):
+            return self.stream(content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    @staticmethod
+    async def stream(content: str):
+        """Yield the reply one word per chunk, shaped like streamed completion deltas."""
+        for word in content.split(" "):
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word))])
+
+
+@pytest.fixture
+def completions(monkeypatch) -> FakeCompletions:
+    """Point GroqClient at a fake API client with fresh cache and limiter state."""
+    completions = FakeCompletions()
+    monkeypatch.setattr(GroqClient, "_initialized", True)
+    monkeypatch.setattr(GroqClient, "_async_groq_client", SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+    monkeypatch.setattr(GroqClient, "_cache", OrderedDict())
+    monkeypatch.setattr(GroqClient, "_inflight", {})
+    monkeypatch.setattr(GroqClient, "_request_times", deque())
+    monkeypatch.setattr(settings, "enable_llm_cache", True)
+    monkeypatch.setattr(settings, "llm_requests_per_minute", 0)
+    return completions
+
+
+class TestResponseCache:
+    """Deterministic or opted-in requests are answered from the LRU."""
+
+    async def test_hit_skips_api(self, completions):
+        """A repeated deterministic prompt is served from cache."""
+        first = await GroqClient.generate_text("phish me", temperature=0)
+        second = await GroqClient.generate_text("phish me", temperature=0)
+
+        assert first == second == "reply to phish me"
+        assert len(completions.requests) == 1
+
+    async def test_miss_on_different_request(self, completions):
+        """Any change to the request payload is a different cache key."""
+        await GroqClient.generate_text("phish me", temperature=0)
+        await GroqClient.generate_text("phish me", temperature=0, max_tokens=50)
+        await GroqClient.generate_text("phish me", temperature=0, model_type="pro")
+
+        assert len(completions.requests) == 3
+
+    async def test_sampled_requests_not_cached_unless_opted_in(self, completions):
+        """temperature > 0 bypasses the cache unless use_cache is set."""
+        await GroqClient.generate_text("story", temperature=0.7)
+        await GroqClient.generate_text("story", temperature=0.7)
+        assert len(completions.requests) == 2
+
+        await GroqClient.generate_text("story", temperature=0.7, use_cache=True)
+        await GroqClient.generate_text("story", temperature=0.7, use_cache=True)
+        assert len(completions.requests) == 3
+
+    async def test_disabled_by_setting(self, completions, monkeypatch):
+        """enable_llm_cache=False turns caching off entirely."""
+        monkeypatch.setattr(settings, "enable_llm_cache", False)
+
+        await GroqClient.generate_text("phish me", temperature=0)
+        await GroqClient.generate_text("phish me", temperature=0)
+
+        assert len(completions.requests) == 2
+
+    async def test_evicts_least_recently_used(self, completions, monkeypatch):
+        """A full cache drops the entry that was used longest ago."""
+        monkeypatch.setattr(settings, "llm_cache_max_entries", 2)
+
+        await GroqClient.generate_text("a", temperature=0)
+        await GroqClient.generate_text("b", temperature=0)
+        await GroqClient.generate_text("a", temperature=0)  # hit: "b" is now oldest
+        await GroqClient.generate_text("c", temperature=0)  # evicts "b"
+        assert len(GroqClient._cache) == 2
+        assert len(completions.requests) == 3
+
+        await GroqClient.generate_text("a", temperature=0)
+        assert len(completions.requests) == 3
+        await GroqClient.generate_text("b", temperature=0)
+        assert len(completions.requests) == 4
+
+
+class TestCoalescing:
+    """Identical cacheable requests in flight at once share one API call."""
+
+    async def test_concurrent_identical_calls_share_one_request(self, completions):
+        completions.gate = asyncio.Event()
+        calls = [asyncio.ensure_future(GroqClient.generate_text("same", temperature=0)) for _ in range(5)]
+        await asyncio.sleep(0)
+        completions.gate.set()
+
+        assert await asyncio.gather(*calls) == ["reply to same"] * 5
+        assert len(completions.requests) == 1
+        assert GroqClient._inflight == {}
+
+    async def test_failure_is_not_cached(self, completions):
+        """Waiters all see the error, and the next call retries the API."""
+        completions.errors = [ValueError("boom")]
+        results = await asyncio.gather(
+            *(GroqClient.generate_text("same", temperature=0) for _ in range(3)),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert await GroqClient.generate_text("same", temperature=0) == "reply to same"
+        assert len(completions.requests) == 2
+
+
+class TestRateLimits:
+    """429 backoff and the client-side requests-per-minute quota."""
+
+    async def test_retries_after_429(self, completions, monkeypatch):
+        """Rate-limit errors are retried with the same request payload."""
+        monkeypatch.setattr(settings, "llm_rate_limit_retries", 3)
+        completions.errors = [RateLimitError(), RateLimitError()]
+
+        assert await GroqClient.generate_text("busy", temperature=0.5) == "reply to busy"
+        assert len(completions.requests) == 3
+        assert all(request == completions.requests[0] for request in completions.requests)
+
+    async def test_gives_up_after_retry_budget(self, completions, monkeypatch):
+        monkeypatch.setattr(settings, "llm_rate_limit_retries", 1)
+        completions.errors = [RateLimitError(), RateLimitError(), RateLimitError()]
+
+        with pytest.raises(RateLimitError):
+            await GroqClient.generate_text("busy", temperature=0.5)
+        assert len(completions.requests) == 2
+
+    async def test_other_errors_not_retried(self, completions):
+        completions.errors = [ValueError("bad request")]
+
+        with pytest.raises(ValueError):
+            await GroqClient.generate_text("bad", temperature=0.5)
+        assert len(completions.requests) == 1
+
+    def test_retry_delay(self):
+        """Retry-After wins; otherwise back off exponentially; non-429s are not retried."""
+        assert GroqClient._retry_delay(RateLimitError("7"), attempt=0) == 7.0
+        assert GroqClient._retry_delay(RateLimitError("soon"), attempt=2) == 4.0
+        assert GroqClient._retry_delay(ValueError(), attempt=0) is None
+
+    async def test_quota_blocks_until_window_frees(self, completions, monkeypatch):
+        """The limiter admits requests_per_minute calls per rolling minute, then waits."""
+        clock = [1000.0]
+        monkeypatch.setattr(groq_client, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+        monkeypatch.setattr(settings, "llm_requests_per_minute", 2)
+
+        await GroqClient._wait_for_rate_slot()
+        await GroqClient._wait_for_rate_slot()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(GroqClient._wait_for_rate_slot(), timeout=0.05)
+
+        clock[0] += 60
+        await asyncio.wait_for(GroqClient._wait_for_rate_slot(), timeout=0.05)
+        assert list(GroqClient._request_times) == [1060.0]
+
+    async def test_stream_counts_against_quota(self, completions, monkeypatch):
+        """Streaming requests take a slot too, so they wait once the minute is used up."""
+        clock = [1000.0]
+        monkeypatch.setattr(groq_client, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+        monkeypatch.setattr(settings, "llm_requests_per_minute", 1)
+
+        await GroqClient.generate_text("first", temperature=0.5)
+
+        async def read_stream():
+            return [delta async for delta in GroqClient.generate_text_stream("second")]
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(read_stream(), timeout=0.05)
+        assert len(completions.requests) == 1
+
+        clock[0] += 60
+        assert await asyncio.wait_for(read_stream(), timeout=0.05) == ["reply", "to", "second"]
+        assert completions.requests[-1]["stream"] is True
@@ -0,0 +1,56 @@
+"""Tests for the API server entry point."""
+
+import pytest
+
+pytest.importorskip("uvicorn")
+
+import main
+from cyberguard.config import settings
+
+
+@pytest.fixture
+def uvicorn_run(monkeypatch):
+    """Capture uvicorn.run calls instead of starting a server."""
+    calls = []
+    monkeypatch.setattr(main.uvicorn, "run", lambda *args, **kwargs: calls.append(kwargs))
+    monkeypatch.setattr(settings, "debug", False)
+    return calls
+
+
+class TestWorkerCount:
+    """Several workers are only started when they can share session state."""
+
+    def test_single_worker_by_default(self, uvicorn_run, monkeypatch):
+        """One worker needs no shared cache."""
+        monkeypatch.setattr(settings, "api_workers", 1)
+        monkeypatch.setattr(main, "_shared_cache_available", lambda: pytest.fail("cache probed"))
+
+        main.main()
+
+        assert len(uvicorn_run) == 1
+        assert uvicorn_run[0]["workers"] == 1
+
+    def test_refuses_workers_without_shared_cache(self, uvicorn_run, monkeypatch):
+        """Several workers without a reachable Redis exit instead of serving split state."""
+        monkeypatch.setattr(settings, "api_workers", 4)
+        monkeypatch.setattr(main, "_shared_cache_available", lambda: False)
+
+        with pytest.raises(SystemExit):
+            main.main()
+
+        assert uvicorn_run == []
+
+    def test_starts_workers_with_shared_cache(self, uvicorn_run, monkeypatch):
+        """Several workers start once the shared cache answers."""
+        monkeypatch.setattr(settings, "api_workers", 4)
+        monkeypatch.setattr(main, "_shared_cache_available", lambda: True)
+
+        main.main()
+
+        assert uvicorn_run[0]["workers"] == 4
+
+    def test_probe_fails_without_redis_url(self, monkeypatch):
+        """With no REDIS_URL configured there is nothing to share."""
+        monkeypatch.setattr(settings, "redis_url", "")
+
+        assert main._shared_cache_available() is False
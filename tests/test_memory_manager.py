@@ -13,8 +13,9 @@ Tests:
 6. A2A communication with other agents
 """
 
-import asyncio
+import os
 import sys
+import traceback
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -27,6 +28,10 @@ from cyberguard.models import (
     SocialEngineeringPattern, AgentMessage, CyberGuardSession
 )
 from agents.memory.memory_manager import MemoryManagerAgent
+from helpers import run_script
+
+# Full tracebacks for failing checks only when CYBERGUARD_TEST_DEBUG is set
+_DEBUG = bool(os.environ.get("CYBERGUARD_TEST_DEBUG"))
 
 
 async def test_memory_manager_initialization():
@@ -50,8 +55,8 @@ async def test_memory_manager_initialization():
         
     except Exception as e:
         print(f"❌ Initialization failed: {e}")
-        import traceback
-        traceback.print_exc()
+        if _DEBUG:
+            traceback.print_exc()
         return None
 
 
@@ -122,8 +127,8 @@ async def test_session_management(memory_manager: MemoryManagerAgent):
         
     except Exception as e:
         print(f"❌ Session management failed: {e}")
-        import traceback
-        traceback.print_exc()
+        if _DEBUG:
+            traceback.print_exc()
         return None
 
 
@@ -195,8 +200,8 @@ async def test_user_profiling(memory_manager: MemoryManagerAgent):
         
     except Exception as e:
         print(f"❌ User profiling failed: {e}")
-        import traceback
-        traceback.print_exc()
+        if _DEBUG:
+            traceback.print_exc()
         return False
 
 
@@ -330,8 +335,8 @@ async def test_pattern_analysis(memory_manager: MemoryManagerAgent):
         
     except Exception as e:
         print(f"❌ Pattern analysis failed: {e}")
-        import traceback
-        traceback.print_exc()
+        if _DEBUG:
+            traceback.print_exc()
         return False
 
 
@@ -410,8 +415,8 @@ async def test_progress_tracking(memory_manager: MemoryManagerAgent):
         
     except Exception as e:
         print(f"❌ Progress tracking failed: {e}")
-        import traceback
-        traceback.print_exc()
+        if _DEBUG:
+            traceback.print_exc()
         return False
 
 
@@ -512,8 +517,8 @@ async def test_a2a_communication(memory_manager: MemoryManagerAgent):
         
     except Exception as e:
         print(f"❌ A2A communication failed: {e}")
-        import traceback
-        traceback.print_exc()
+        if _DEBUG:
+            traceback.print_exc()
         return False
 
 
@@ -621,8 +626,8 @@ async def test_memory_integration():
         
     except Exception as e:
         print(f"❌ Memory integration test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        if _DEBUG:
+            traceback.print_exc()
         return False
 
 
@@ -695,4 +700,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run_script(main())
\ No newline at end of file
@@ -0,0 +1,226 @@
+"""Tests for CyberGuardOrchestrator session lifecycle handling."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from cyberguard.config import settings
+from cyberguard.models import (
+    CyberGuardSession,
+    DecisionPoint,
+    ThreatType,
+    UserRole,
+)
+from cyberguard.orchestrator import CyberGuardOrchestrator
+
+
+def make_session(session_id: str) -> CyberGuardSession:
+    """Build a minimal in-progress phishing session."""
+    return CyberGuardSession(
+        session_id=session_id,
+        user_id=f"user_{session_id}",
+        scenario_type=ThreatType.PHISHING,
+        scenario_id="phish_001",
+        user_role=UserRole.GENERAL
+    )
+
+
+def make_decision(turn: int) -> DecisionPoint:
+    """Build a decision point for the given turn."""
+    return DecisionPoint(
+        turn=turn,
+        vulnerability="phishing_urgency",
+        user_choice="click_link",
+        correct_choice="report_suspicious",
+        risk_score_impact=1.0
+    )
+
+
+@pytest.fixture
+def orchestrator() -> CyberGuardOrchestrator:
+    """An uninitialized orchestrator whose storage and evaluation agent are mocked."""
+    orchestrator = CyberGuardOrchestrator()
+    orchestrator.session_manager.save_session = AsyncMock(return_value=True)
+    orchestrator.evaluation_agent.process_message = AsyncMock()
+    return orchestrator
+
+
+class TestSessionEviction:
+    """Sessions pushed out of the in-process LRU must not lose buffered state."""
+
+    async def test_lru_eviction_flushes_decisions(self, orchestrator, monkeypatch):
+        """Evicting a session delivers its buffered decisions and saves it."""
+        monkeypatch.setattr(settings, "max_active_sessions", 1)
+        first, second = make_session("evict_a"), make_session("evict_b")
+
+        await orchestrator._remember_session(first)
+        orchestrator._pending_decisions[first.session_id] = [make_decision(1), make_decision(2)]
+        await orchestrator._remember_session(second)
+
+        assert list(orchestrator.active_sessions) == [second.session_id]
+        assert first.session_id not in orchestrator._pending_decisions
+        orchestrator.session_manager.save_session.assert_awaited_once_with(first)
+
+        message = orchestrator.evaluation_agent.process_message.await_args.args[0]
+        assert message.message_type == "decisions_made"
+        assert message.session_id == first.session_id
+        assert [d["turn"] for d in message.payload["decisions"]] == [1, 2]
+
+    async def test_lru_eviction_releases_game_master_copy(self, orchestrator, monkeypatch):
+        """The Game Master stops tracking a session the orchestrator evicted."""
+        monkeypatch.setattr(settings, "max_active_sessions", 1)
+        first, second = make_session("evict_gm_a"), make_session("evict_gm_b")
+        orchestrator.game_master.active_sessions[first.session_id] = first
+        orchestrator.game_master.active_sessions[second.session_id] = second
+
+        await orchestrator._remember_session(first)
+        await orchestrator._remember_session(second)
+
+        assert first.session_id not in orchestrator.game_master.active_sessions
+        assert second.session_id in orchestrator.game_master.active_sessions
+
+
+class TestEvaluationEventDrain:
+    """Completing a session waits only for its own queued evaluation events."""
+
+    @staticmethod
+    def start_worker(orchestrator: CyberGuardOrchestrator) -> None:
+        """Start the evaluation event consumer without a full initialize()."""
+        orchestrator._evaluation_events = asyncio.Queue()
+        orchestrator._evaluation_worker = orchestrator._spawn(orchestrator._run_evaluation_worker())
+
+    async def test_waits_for_own_events_only(self, orchestrator, monkeypatch):
+        """A stuck event for another session does not hold up this one."""
+        monkeypatch.setattr(settings, "evaluation_batch_max_events", 1)
+        release = asyncio.Event()
+
+        async def deliver(message):
+            if message.session_id == "drain_b":
+                await release.wait()
+
+        orchestrator.evaluation_agent.process_message = AsyncMock(side_effect=deliver)
+        self.start_worker(orchestrator)
+
+        await orchestrator._notify_evaluation_agent("session_started", make_session("drain_a"))
+        await orchestrator._notify_evaluation_agent("session_started", make_session("drain_b"))
+        await asyncio.wait_for(
+            orchestrator._await_evaluation_delivery(orchestrator._events_delivered["drain_a"], "drain_a"),
+            timeout=1
+        )
+
+        assert "drain_a" not in orchestrator._events_delivered
+        assert orchestrator._queued_event_counts == {"drain_b": 1}
+
+        release.set()
+        await asyncio.wait_for(orchestrator._events_delivered["drain_b"], timeout=1)
+        orchestrator._evaluation_worker.cancel()
+        await asyncio.gather(orchestrator._evaluation_worker, return_exceptions=True)
+
+    async def test_dead_worker_does_not_hang(self, orchestrator, monkeypatch):
+        """Waiting returns once the worker has stopped, well before the drain timeout."""
+        monkeypatch.setattr(settings, "evaluation_drain_timeout_seconds", 30.0)
+        orchestrator._evaluation_events = asyncio.Queue()
+        orchestrator._evaluation_worker = asyncio.ensure_future(asyncio.Event().wait())
+
+        await orchestrator._notify_evaluation_agent("session_started", make_session("drain_dead"))
+        orchestrator._evaluation_worker.cancel()
+
+        await asyncio.wait_for(
+            orchestrator._await_evaluation_delivery(orchestrator._events_delivered["drain_dead"], "drain_dead"),
+            timeout=1
+        )
+        assert not orchestrator._events_delivered["drain_dead"].done()
+
+
+class TestWriteBehind:
+    """Dirty sessions are saved by the flusher and never lost at shutdown."""
+
+    async def test_flush_respects_delay(self, orchestrator):
+        """Only sessions dirty for at least max_age are written."""
+        session = make_session("dirty_young")
+        await orchestrator._remember_session(session)
+        orchestrator._dirty_sessions[session.session_id] = time.time()
+
+        await orchestrator._flush_dirty_sessions(max_age=60)
+        orchestrator.session_manager.save_session.assert_not_awaited()
+
+        await orchestrator._flush_dirty_sessions(max_age=0)
+        orchestrator.session_manager.save_session.assert_awaited_once_with(session)
+        assert orchestrator._dirty_sessions == {}
+
+    async def test_failed_flush_stays_dirty(self, orchestrator):
+        """A save that raises leaves the session queued for the next pass."""
+        session = make_session("dirty_failing")
+        await orchestrator._remember_session(session)
+        orchestrator._dirty_sessions[session.session_id] = 0.0
+        orchestrator.session_manager.save_session.side_effect = OSError("disk full")
+
+        await orchestrator._flush_dirty_sessions(max_age=0)
+
+        assert session.session_id in orchestrator._dirty_sessions
+
+    async def test_shutdown_flushes_dirty_sessions(self, orchestrator, monkeypatch):
+        """Turns only in the turn log are folded into a snapshot on shutdown."""
+        monkeypatch.setattr(settings, "session_flush_interval_seconds", 3600)
+        for component in (
+            orchestrator.game_master, orchestrator.phishing_agent, orchestrator.evaluation_agent,
+            orchestrator.memory_manager, orchestrator.user_profiler, orchestrator.cache,
+            orchestrator.session_manager
+        ):
+            component.shutdown = AsyncMock()
+        # Completion is covered elsewhere; here the session must survive to the flush
+        orchestrator.complete_scenario = AsyncMock()
+        orchestrator.session_manager.append_turn = AsyncMock(return_value=True)
+        orchestrator._session_flusher = orchestrator._spawn(orchestrator._flush_dirty_sessions_periodically())
+        orchestrator.initialized = True
+
+        session = make_session("dirty_at_shutdown")
+        await orchestrator._remember_session(session)
+        session.add_message("user", "last turn")
+        await orchestrator._persist_session(session)
+        orchestrator.session_manager.append_turn.assert_awaited_once_with(session)
+        orchestrator.session_manager.save_session.assert_not_awaited()
+
+        await orchestrator.shutdown()
+
+        orchestrator.session_manager.save_session.assert_awaited_once_with(session)
+        assert orchestrator._dirty_sessions == {}
+        assert orchestrator._session_flusher is None
+
+
+class TestEvaluationBatching:
+    """Queued evaluation events reach the Evaluation Agent in publish order."""
+
+    async def test_batched_decisions_tracked_in_order(self, monkeypatch):
+        """Several decisions_made flushes coalesce into one evaluate_batch and keep turn order."""
+        monkeypatch.setattr(settings, "evaluation_batch_window_ms", 200)
+        monkeypatch.setattr(settings, "evaluation_batch_max_events", 10)
+        orchestrator = CyberGuardOrchestrator()
+        evaluator = orchestrator.evaluation_agent
+        await evaluator.initialize()
+        delivered = AsyncMock(side_effect=evaluator.process_message)
+        monkeypatch.setattr(evaluator, "process_message", delivered)
+        TestEvaluationEventDrain.start_worker(orchestrator)
+
+        session = make_session("batch_order")
+        await orchestrator._notify_evaluation_agent("session_started", session)
+        for turns in ((1, 2), (3,), (4, 5)):
+            orchestrator._pending_decisions[session.session_id] = [make_decision(turn) for turn in turns]
+            await orchestrator._flush_decisions(session)
+        await orchestrator._await_evaluation_delivery(
+            orchestrator._events_delivered[session.session_id], session.session_id
+        )
+
+        assert delivered.await_count == 1 + 4  # the batch, then each event it carried
+        batch = delivered.await_args_list[0].args[0]
+        assert batch.message_type == "evaluate_batch"
+        assert [event["message_type"] for event in batch.payload["events"]] == [
+            "session_started", "decisions_made", "decisions_made", "decisions_made"
+        ]
+        tracked = evaluator.evaluation_metrics[session.session_id]["decisions"]
+        assert [d["decision_point"]["turn"] for d in tracked] == [1, 2, 3, 4, 5]
+
+        orchestrator._evaluation_worker.cancel()
+        await asyncio.gather(orchestrator._evaluation_worker, return_exceptions=True)
@@ -10,7 +10,6 @@ This test validates:
 5. Adaptive scenario modification based on user responses
 """
 
-import asyncio
 import sys
 from pathlib import Path
 
@@ -26,6 +25,7 @@ from cyberguard.models import (
     AgentMessage
 )
 from agents.threat_actors.phishing import PhishingAgent
+from helpers import run_script
 
 
 async def test_phishing_agent_initialization():
@@ -335,4 +335,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run_script(main())
\ No newline at end of file
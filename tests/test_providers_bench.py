@@ -0,0 +1,104 @@
+"""
+Latency benchmarks for the Groq provider.
+
+These mirror the probes in scripts/test_groq.py but run each one several
+times and record min/mean/p95 latency as test properties, so CI can pick the
+numbers up from the JUnit XML and compare runs. They only run when the groq
+package is installed and GROQ_API_KEY is configured.
+"""
+
+import statistics
+import time
+
+import pytest
+
+pytest.importorskip("groq")
+
+from cyberguard.config import settings
+from cyberguard.groq_client import GroqClient
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.slow,
+    pytest.mark.skipif(not settings.groq_api_key, reason="GROQ_API_KEY not set"),
+]
+
+ROUNDS = 5
+
+
+@pytest.fixture(scope="module", autouse=True)
+def groq_client():
+    """Initialize the shared Groq client once for the whole module."""
+    GroqClient.initialize()
+    yield
+    GroqClient.clear_cache()
+
+
+async def _benchmark(record_property, call, rounds: int = ROUNDS) -> dict:
+    """Await call() `rounds` times and record latency stats in seconds."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = await call()
+        timings.append(time.perf_counter() - start)
+        assert result
+
+    timings.sort()
+    stats = {
+        "min": timings[0],
+        "mean": statistics.fmean(timings),
+        "p95": timings[min(len(timings) - 1, round(0.95 * (len(timings) - 1)))],
+    }
+    for name, value in stats.items():
+        record_property(f"latency_{name}_s", round(value, 4))
+    return stats
+
+
+# use_cache=False everywhere: a cached response would measure the LRU, not the provider
+
+async def test_flash_hello(record_property):
+    """Short completion on the flash model."""
+    await _benchmark(record_property, lambda: GroqClient.generate_text(
+        prompt="Say 'Hello from Groq!' and nothing else.",
+        model_type="flash",
+        temperature=0.2,
+        max_tokens=50,
+        use_cache=False
+    ))
+
+
+async def test_pro_hello(record_property):
+    """Short completion on the pro model."""
+    await _benchmark(record_property, lambda: GroqClient.generate_text(
+        prompt="Say 'Pro model working!' and nothing else.",
+        model_type="pro",
+        temperature=0.2,
+        max_tokens=50,
+        use_cache=False
+    ))
+
+
+async def test_phishing_subject(record_property):
+    """Educational phishing subject line, the scenario hot path."""
+    await _benchmark(record_property, lambda: GroqClient.generate_text(
+        prompt="Generate a realistic phishing email subject line that pretends to be from PayPal asking to verify account. This is for cybersecurity training.",
+        model_type="flash",
+        temperature=0.7,
+        max_tokens=100,
+        use_cache=False
+    ))
+
+
+async def test_context_chat(record_property):
+    """Multi-message completion with a system instruction."""
+    messages = [
+        {"role": "user", "content": "I received a suspicious email from 'paypa1.com'. What should I do?"},
+    ]
+    await _benchmark(record_property, lambda: GroqClient.generate_with_context(
+        messages=messages,
+        model_type="flash",
+        temperature=0.5,
+        max_tokens=200,
+        system_instruction="You are a cybersecurity training assistant.",
+        use_cache=False
+    ))
@@ -0,0 +1,243 @@
+"""Tests for the sharded Redis session/profile cache."""
+
+import sys
+import types
+from typing import Any, Dict, Optional
+from unittest.mock import AsyncMock
+
+import pytest
+
+from cyberguard.models import CyberGuardSession, ThreatType, UserRole
+from cyberguard.orchestrator import CyberGuardOrchestrator
+from cyberguard.redis_cache import HashRing, RedisCache
+
+
+class FakeRedis:
+    """In-memory stand-in for a redis.asyncio client (only the calls RedisCache makes)."""
+
+    def __init__(self):
+        self.store: Dict[str, str] = {}
+        self.closed = False
+
+    async def get(self, key: str) -> Optional[str]:
+        return self.store.get(key)
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> None:
+        self.store[key] = value
+
+    async def delete(self, key: str) -> None:
+        self.store.pop(key, None)
+
+    async def ping(self) -> bool:
+        return True
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class BrokenRedis(FakeRedis):
+    """A client whose every command fails, as with a dropped connection."""
+
+    async def get(self, key: str) -> Any:
+        raise ConnectionError("connection reset")
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> None:
+        raise ConnectionError("connection reset")
+
+    async def ping(self) -> bool:
+        raise ConnectionError("connection refused")
+
+
+@pytest.fixture
+def redis_module(monkeypatch) -> Dict[str, FakeRedis]:
+    """
+    Make ``import redis.asyncio`` hand out fake clients.
+    
+    Returns the clients created so far, by URL. URLs containing "down" get a
+    client that cannot be reached.
+    """
+    clients: Dict[str, FakeRedis] = {}
+
+    def from_url(url: str, decode_responses: bool = False) -> FakeRedis:
+        clients[url] = BrokenRedis() if "down" in url else FakeRedis()
+        return clients[url]
+
+    package = types.ModuleType("redis")
+    package.asyncio = types.ModuleType("redis.asyncio")
+    package.asyncio.from_url = from_url
+    monkeypatch.setitem(sys.modules, "redis", package)
+    monkeypatch.setitem(sys.modules, "redis.asyncio", package.asyncio)
+    return clients
+
+
+def connect(cache: RedisCache, clients: Dict[str, Any]) -> RedisCache:
+    """Attach pre-built clients to a cache, as initialize() would after a successful ping."""
+    cache._clients = clients
+    cache._ring = HashRing(cache.urls)
+    return cache
+
+
+def make_session(session_id: str) -> CyberGuardSession:
+    """Build a minimal in-progress phishing session."""
+    return CyberGuardSession(
+        session_id=session_id,
+        user_id=f"user_{session_id}",
+        scenario_type=ThreatType.PHISHING,
+        scenario_id="phish_001",
+        user_role=UserRole.GENERAL
+    )
+
+
+class TestHashRing:
+    """Consistent hashing across cache nodes."""
+
+    NODES = ["redis://a", "redis://b", "redis://c"]
+    KEYS = [f"session_{i}" for i in range(1000)]
+
+    def test_stable_assignment(self):
+        """Separately built rings agree, so every worker routes a key the same way."""
+        first, second = HashRing(self.NODES), HashRing(list(reversed(self.NODES)))
+        assert all(first.get_node(key) == second.get_node(key) for key in self.KEYS)
+
+    def test_keys_spread_over_all_nodes(self):
+        """Every node owns a reasonable share of keys."""
+        ring = HashRing(self.NODES)
+        counts = {node: 0 for node in self.NODES}
+        for key in self.KEYS:
+            counts[ring.get_node(key)] += 1
+        assert min(counts.values()) > len(self.KEYS) / len(self.NODES) / 2
+
+    def test_removing_node_only_moves_its_keys(self):
+        """Keys owned by surviving nodes stay where they were."""
+        full, reduced = HashRing(self.NODES), HashRing(self.NODES[:2])
+        for key in self.KEYS:
+            owner = full.get_node(key)
+            if owner != self.NODES[2]:
+                assert reduced.get_node(key) == owner
+
+
+class TestRedisCache:
+    """Session and profile caching through fake Redis clients."""
+
+    def test_disabled_without_url(self):
+        """No REDIS_URL means no shards and every call is a no-op."""
+        assert not RedisCache(url="").enabled
+
+    async def test_session_round_trip(self):
+        """A cached session reads back equal to what was written."""
+        cache = connect(RedisCache(url="redis://a"), {"redis://a": FakeRedis()})
+        session = make_session("cache_round_trip")
+        session.add_message("user", "hello")
+
+        await cache.set_session(session)
+        cached = await cache.get_session(session.session_id)
+
+        assert cached.model_dump() == session.model_dump()
+
+    async def test_keys_land_on_ring_shard(self):
+        """Each session is written only to the node the ring picks for it."""
+        urls = ["redis://a", "redis://b"]
+        clients = {url: FakeRedis() for url in urls}
+        cache = connect(RedisCache(url=",".join(urls)), clients)
+
+        for i in range(20):
+            session = make_session(f"shard_{i}")
+            await cache.set_session(session)
+            owner = cache._ring.get_node(session.session_id)
+            key = f"{RedisCache.SESSION_PREFIX}{session.session_id}"
+            assert all((key in client.store) == (url == owner) for url, client in clients.items())
+
+    async def test_failures_degrade_to_miss(self):
+        """A failing node reads as a cache miss instead of raising."""
+        cache = connect(RedisCache(url="redis://a"), {"redis://a": BrokenRedis()})
+        session = make_session("cache_broken")
+
+        await cache.set_session(session)
+        assert await cache.get_session(session.session_id) is None
+        assert await cache.get_profile("user") is None
+
+    async def test_profile_round_trip_and_delete(self):
+        """Profiles are cached as JSON and can be invalidated."""
+        cache = connect(RedisCache(url="redis://a"), {"redis://a": FakeRedis()})
+        profile = {"user_id": "u1", "current_difficulty": 3}
+
+        await cache.set_profile("u1", profile)
+        assert await cache.get_profile("u1") == profile
+        await cache.delete_profile("u1")
+        assert await cache.get_profile("u1") is None
+
+
+class TestShardedStartup:
+    """All configured nodes must answer before any of them is used."""
+
+    async def test_connects_every_node(self, redis_module):
+        cache = RedisCache(url="redis://a, redis://b,redis://c")
+        await cache.initialize()
+
+        assert cache.enabled
+        assert list(cache._clients) == ["redis://a", "redis://b", "redis://c"]
+        assert {cache._ring.get_node(f"session_{i}") for i in range(100)} == set(cache.urls)
+
+        await cache.shutdown()
+        assert not cache.enabled
+        assert all(client.closed for client in redis_module.values())
+
+    async def test_partial_ring_disables_cache(self, redis_module):
+        """One unreachable node disables caching, since workers would disagree on key placement."""
+        cache = RedisCache(url="redis://a,redis://down")
+        await cache.initialize()
+
+        assert not cache.enabled
+        assert all(client.closed for client in redis_module.values())
+        assert await cache.get_session("any") is None
+
+    async def test_single_node_skips_ring_lookup(self, redis_module):
+        """With one node every key goes to it."""
+        cache = RedisCache(url="redis://only")
+        await cache.initialize()
+
+        assert all(cache._shard(f"session_{i}") is redis_module["redis://only"] for i in range(10))
+
+
+class TestSharedSessionState:
+    """Two API workers sharing one Redis must not serve each other stale sessions."""
+
+    @staticmethod
+    def make_worker(redis: FakeRedis) -> CyberGuardOrchestrator:
+        worker = CyberGuardOrchestrator()
+        worker.cache = connect(RedisCache(url="redis://shared"), {"redis://shared": redis})
+        worker.session_manager.save_session = AsyncMock(return_value=True)
+        worker.session_manager.load_session = AsyncMock(return_value=None)
+        return worker
+
+    async def test_read_after_write_across_workers(self):
+        """A turn persisted by one worker is visible to another that already holds the session."""
+        redis = FakeRedis()
+        worker_a, worker_b = self.make_worker(redis), self.make_worker(redis)
+        session = make_session("shared_session")
+        await worker_a.cache.set_session(session)
+
+        # Both workers have served this session before and hold a local copy
+        local_a = await worker_a._lookup_session(session.session_id)
+        await worker_a._remember_session(local_a)
+        local_b = await worker_b._lookup_session(session.session_id)
+        await worker_b._remember_session(local_b)
+
+        local_b.add_message("user", "handled by worker B")
+        await worker_b._persist_session(local_b)
+
+        seen_by_a = await worker_a._lookup_session(session.session_id)
+        assert seen_by_a.conversation_history[-1]["content"] == "handled by worker B"
+        assert worker_a.active_sessions[session.session_id] is seen_by_a
+
+    async def test_local_copy_kept_when_newest(self):
+        """A worker's own unsaved-to-Redis changes are not rolled back by an older cached copy."""
+        redis = FakeRedis()
+        worker = self.make_worker(redis)
+        session = make_session("local_newest")
+        await worker.cache.set_session(session)
+        await worker._remember_session(session)
+
+        session.add_message("user", "local only")
+
+        assert await worker._lookup_session(session.session_id) is session
@@ -0,0 +1,96 @@
+"""Tests for SessionManager snapshot and turn log persistence."""
+
+import pytest
+
+from cyberguard.models import (
+    CyberGuardSession,
+    DecisionPoint,
+    ThreatType,
+    UserRole,
+)
+from tools.session_manager import SessionManager
+
+
+@pytest.fixture
+def session_manager(tmp_path) -> SessionManager:
+    """A session manager writing to a temporary directory."""
+    manager = SessionManager()
+    manager.storage_path = tmp_path
+    return manager
+
+
+@pytest.fixture
+def session() -> CyberGuardSession:
+    """An in-progress session with one turn already played."""
+    session = CyberGuardSession(
+        session_id="turn_log_session",
+        user_id="test_user_log",
+        scenario_type=ThreatType.PHISHING,
+        scenario_id="phish_001",
+        user_role=UserRole.FINANCE
+    )
+    session.add_message("game_master", "You have a new email.")
+    return session
+
+
+def play_turn(session: CyberGuardSession, turn: int) -> None:
+    """Apply every kind of change a Game Master turn can make."""
+    session.add_message("user", f"action {turn}")
+    session.add_message("game_master", f"narrative {turn}")
+    session.record_decision(DecisionPoint(
+        turn=turn,
+        vulnerability="phishing_urgency",
+        user_choice="click_link",
+        correct_choice="report_suspicious",
+        risk_score_impact=1.0
+    ))
+    session.current_state = f"state_{turn}"
+    session.current_phase = "escalation"
+    session.threat_actor_active = "phishing_agent"
+    session.threat_content = {"subject": "Urgent invoice", "turn": turn}
+    session.hints_used = turn
+    session.pause_count = turn
+
+
+class TestTurnLog:
+    """Snapshot + appended turns must reload to the same session."""
+
+    async def test_round_trip(self, session_manager, session):
+        """A reloaded session matches the in-memory one field for field."""
+        assert await session_manager.save_session(session)
+        for turn in (1, 2):
+            play_turn(session, turn)
+            assert await session_manager.append_turn(session)
+
+        reader = SessionManager()
+        reader.storage_path = session_manager.storage_path
+        loaded = await reader.load_session(session.session_id)
+
+        assert loaded is not None
+        assert loaded.model_dump() == session.model_dump()
+
+    async def test_snapshot_folds_in_log(self, session_manager, session):
+        """A full save replaces the turn log without losing turn state."""
+        assert await session_manager.save_session(session)
+        play_turn(session, 1)
+        assert await session_manager.append_turn(session)
+        session.evaluation = {"overall_score": 80.0}
+        assert await session_manager.save_session(session)
+
+        assert not session_manager._turn_log_path(session.session_id).exists()
+        loaded = await session_manager.load_session(session.session_id)
+        # Snapshots store updated_at as ISO text, i.e. to the microsecond
+        timestamps = {"updated_at", "updated_at_ts"}
+        assert loaded.model_dump(exclude=timestamps) == session.model_dump(exclude=timestamps)
+        assert loaded.updated_at_ts == pytest.approx(session.updated_at_ts, abs=1e-5)
+
+    async def test_completed_session_stops_tracking(self, session_manager, session):
+        """The final save of a finished session drops its logged counts."""
+        assert await session_manager.save_session(session)
+        assert session.session_id in session_manager._logged_counts
+
+        session.end_time = session.start_time + 60
+        session.is_active = False
+        assert await session_manager.save_session(session)
+
+        assert session.session_id not in session_manager._logged_counts
@@ -11,20 +11,58 @@ Key Features:
 - Conversation history tracking
 - Session timeout and cleanup
 - Concurrent session handling
+- Append-only turn log between full snapshots
 """
 
 import asyncio
 import json
 import os
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 from loguru import logger
 
-from cyberguard.models import CyberGuardSession, UserRole, DifficultyLevel, ThreatType, DecisionPoint
+try:
+    import orjson
+except ImportError:  # declared dependency; stdlib json keeps bare checkouts working
+    orjson = None
+
+from cyberguard.models import (
+    CyberGuardSession, UserRole, DifficultyLevel, ThreatType, DecisionPoint,
+    USER_ROLE_BY_STR, DIFFICULTY_BY_INT
+)
 from cyberguard.config import Settings
 
 
+# Session fields a turn can change besides the message and decision lists; the turn log
+# records all of them so replaying it restores the same state a full save would
+_TURN_FIELDS = frozenset({
+    "current_state",
+    "current_phase",
+    "threat_actor_active",
+    "threat_content",
+    "evaluation",
+    "hints_used",
+    "pause_count",
+    "is_active",
+    "end_time",
+    "updated_at_ts",
+})
+
+
+def _dump_json(data: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def _load_json(raw: Union[str, bytes]) -> Any:
+    """Parse JSON text or bytes, using orjson when available."""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
 class SessionManager:
     """
     Manages persistent session storage and retrieval.
@@ -37,6 +75,8 @@ class SessionManager:
         self.settings = Settings()
         self.storage_path = Path("data/sessions")
         self.active_sessions: Dict[str, str] = {}  # session_id -> file_path
+        # session_id -> (messages, decisions) already covered by the snapshot + turn log
+        self._logged_counts: Dict[str, tuple] = {}
         self.session_timeout = timedelta(minutes=self.settings.session_timeout_minutes)
         
         logger.info("[SessionManager] Session manager created")
@@ -105,24 +145,39 @@ class SessionManager:
                 "scenario_type": session.scenario_type.value if hasattr(session.scenario_type, 'value') else session.scenario_type,
                 "scenario_id": session.scenario_id,
                 "current_state": session.current_state,
+                "current_phase": session.current_phase,
                 "conversation_history": session.conversation_history,
-                "decision_points": [dp.dict() if hasattr(dp, 'dict') else dp for dp in session.decision_points],
+                "decision_points": [dp.model_dump() if hasattr(dp, 'model_dump') else dp for dp in session.decision_points],
                 "threat_actor_active": session.threat_actor_active,
+                "threat_content": session.threat_content,
+                "evaluation": session.evaluation,
                 "hints_used": session.hints_used,
                 "pause_count": session.pause_count,
+                "is_active": session.is_active,
                 "created_at": session.created_at.isoformat(),
                 "updated_at": session.updated_at.isoformat()
             }
             
             # Write to temp file first (atomic write pattern)
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(session_data, f, indent=2, ensure_ascii=False)
+            with open(temp_file, 'wb') as f:
+                f.write(_dump_json(session_data, indent=True))
                 f.flush()
                 os.fsync(f.fileno())  # Ensure data is written to disk
             
             # Rename temp file to actual file (atomic operation on POSIX and modern Windows)
             temp_file.replace(session_file)
             
+            # The snapshot supersedes any turns appended since the last one;
+            # a finished session takes no more turns, so stop tracking it
+            self._turn_log_path(session.session_id).unlink(missing_ok=True)
+            if session.end_time is None:
+                self._logged_counts[session.session_id] = (
+                    len(session.conversation_history),
+                    len(session.decision_points)
+                )
+            else:
+                self._logged_counts.pop(session.session_id, None)
+            
             # Update active sessions registry
             if session.end_time is None:  # Session is active if not ended
                 self.active_sessions[session.session_id] = str(session_file)
@@ -137,6 +192,46 @@ class SessionManager:
             logger.error(f"[SessionManager] Failed to save session {session.session_id[:8]}...: {e}")
             return False
     
+    async def append_turn(self, session: CyberGuardSession) -> bool:
+        """
+        Append what changed since the last write to the session's turn log.
+        
+        Much cheaper than save_session for long conversations: only the new
+        messages and decisions are serialized, alongside the session's other
+        turn-mutable fields. load_session replays the log over the last
+        snapshot, and the next save_session folds it in.
+        Falls back to a full save when this process has no snapshot yet.
+        
+        Args:
+            session: CyberGuardSession to log
+            
+        Returns:
+            bool: True if written successfully, False otherwise
+        """
+        counts = self._logged_counts.get(session.session_id)
+        if counts is None:
+            return await self.save_session(session)
+        
+        logged_messages, logged_decisions = counts
+        try:
+            entry = {
+                "messages": session.conversation_history[logged_messages:],
+                "decision_points": [dp.model_dump() for dp in session.decision_points[logged_decisions:]],
+                **session.model_dump(mode="json", include=_TURN_FIELDS)
+            }
+            with open(self._turn_log_path(session.session_id), 'ab') as f:
+                f.write(_dump_json(entry) + b"\n")
+            
+            self._logged_counts[session.session_id] = (
+                len(session.conversation_history),
+                len(session.decision_points)
+            )
+            return True
+            
+        except Exception as e:
+            logger.error(f"[SessionManager] Failed to append turn for {session.session_id[:8]}...: {e}")
+            return False
+    
     async def load_session(self, session_id: str) -> Optional[CyberGuardSession]:
         """
         Load session from persistent storage.
@@ -156,28 +251,32 @@ class SessionManager:
                 return None
             
             # Load session data
-            with open(session_file, 'r', encoding='utf-8') as f:
-                session_data = json.load(f)
+            session_data = _load_json(session_file.read_bytes())
             
             # Convert back to CyberGuardSession object
             session = CyberGuardSession(
                 session_id=session_data["session_id"],
                 user_id=session_data["user_id"],
-                user_role=UserRole(session_data["user_role"]),
+                user_role=USER_ROLE_BY_STR.get(session_data["user_role"]) or UserRole(session_data["user_role"]),
                 scenario_type=ThreatType(session_data["scenario_type"]),
                 scenario_id=session_data["scenario_id"],
-                current_difficulty=DifficultyLevel(session_data["current_difficulty"]),
+                current_difficulty=DIFFICULTY_BY_INT.get(session_data["current_difficulty"]) or DifficultyLevel(session_data["current_difficulty"]),
                 current_state=session_data.get("current_state", "intro"),
-                start_time=session_data.get("start_time", datetime.now().timestamp()),
+                current_phase=session_data.get("current_phase", "intro"),
+                start_time=session_data.get("start_time", time.time()),
                 end_time=session_data.get("end_time"),
                 conversation_history=session_data.get("conversation_history", []),
                 decision_points=session_data.get("decision_points", []),
                 threat_actor_active=session_data.get("threat_actor_active"),
+                threat_content=session_data.get("threat_content"),
+                evaluation=session_data.get("evaluation"),
                 hints_used=session_data.get("hints_used", 0),
                 pause_count=session_data.get("pause_count", 0),
+                is_active=session_data.get("is_active", True),
                 created_at=datetime.fromisoformat(session_data["created_at"]),
                 updated_at=datetime.fromisoformat(session_data["updated_at"])
             )
+            self._replay_turn_log(session)
             
             logger.debug(f"[SessionManager] Loaded session: {session_id[:8]}...")
             return session
@@ -244,8 +343,7 @@ class SessionManager:
             # Check all session files
             for session_file in self.storage_path.glob("*.json"):
                 try:
-                    with open(session_file, 'r', encoding='utf-8') as f:
-                        session_data = json.load(f)
+                    session_data = _load_json(session_file.read_bytes())
                     
                     updated_at = session_data.get("updated_at")
                     if updated_at:
@@ -257,6 +355,8 @@ class SessionManager:
                         # Remove file and from active sessions
                         session_id = session_data["session_id"]
                         session_file.unlink()
+                        self._turn_log_path(session_id).unlink(missing_ok=True)
+                        self._logged_counts.pop(session_id, None)
                         
                         if session_id in self.active_sessions:
                             del self.active_sessions[session_id]
@@ -294,8 +394,7 @@ class SessionManager:
             # Check all session files
             for session_file in self.storage_path.glob("*.json"):
                 try:
-                    with open(session_file, 'r', encoding='utf-8') as f:
-                        session_data = json.load(f)
+                    session_data = _load_json(session_file.read_bytes())
                     
                     if session_data.get("user_id") == user_id:
                         if not active_only or session_data.get("is_active", False):
@@ -328,8 +427,7 @@ class SessionManager:
                     total_sessions += 1
                     total_size += session_file.stat().st_size
                     
-                    with open(session_file, 'r', encoding='utf-8') as f:
-                        session_data = json.load(f)
+                    session_data = _load_json(session_file.read_bytes())
                     
                     if session_data.get("is_active", False):
                         active_sessions += 1
@@ -352,14 +450,42 @@ class SessionManager:
     
     # Private Helper Methods
     
+    def _turn_log_path(self, session_id: str) -> Path:
+        """Path of the append-only turn log that follows a session snapshot."""
+        return self.storage_path / f"{session_id}.log"
+    
+    def _replay_turn_log(self, session: CyberGuardSession) -> None:
+        """Apply turns appended after the snapshot a session was loaded from."""
+        log_file = self._turn_log_path(session.session_id)
+        if not log_file.exists():
+            return
+        
+        with open(log_file, 'rb') as f:
+            for line in f:
+                try:
+                    entry = _load_json(line)
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted append; earlier turns still apply
+                    logger.warning(f"[SessionManager] Skipping unreadable turn log entry for {session.session_id[:8]}...")
+                    break
+                session.conversation_history.extend(entry.get("messages", []))
+                session.decision_points.extend(DecisionPoint(**dp) for dp in entry.get("decision_points", []))
+                for field in _TURN_FIELDS.intersection(entry):
+                    setattr(session, field, entry[field])
+        
+        if session.end_time is None:
+            self._logged_counts[session.session_id] = (
+                len(session.conversation_history),
+                len(session.decision_points)
+            )
+    
     async def _load_active_sessions_registry(self) -> None:
         """Load the active sessions registry from file."""
         try:
             registry_file = self.storage_path / "active_sessions.json"
             
             if registry_file.exists():
-                with open(registry_file, 'r', encoding='utf-8') as f:
-                    self.active_sessions = json.load(f)
+                self.active_sessions = _load_json(registry_file.read_bytes())
                 
                 logger.debug(f"[SessionManager] Loaded {len(self.active_sessions)} active sessions from registry")
             
@@ -372,8 +498,7 @@ class SessionManager:
         try:
             registry_file = self.storage_path / "active_sessions.json"
             
-            with open(registry_file, 'w', encoding='utf-8') as f:
-                json.dump(self.active_sessions, f, indent=2)
+            registry_file.write_bytes(_dump_json(self.active_sessions, indent=True))
             
             logger.debug(f"[SessionManager] Saved {len(self.active_sessions)} active sessions to registry")
             